@@ -0,0 +1,484 @@
+"""
+Pinoy Skater - Asset Manager
+Loads images and sounds by path once per process and shares them between
+every object that asks for the same file
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from atlas import TextureAtlas
+from simulation import scale_step, step_scale
+
+try:
+    import mmap
+except ImportError:  # Not every WebAssembly build ships mmap
+    mmap = None
+
+# Pygbag (WebAssembly) builds have no threads
+THREADS_AVAILABLE = sys.platform != "emscripten"
+
+# Baked asset cache written by bake.py
+BAKE_DIR = "cache"
+BAKE_BLOB = "assets.bin"
+BAKE_INDEX = "assets.json"
+
+# Byte order of a 32-bit display-format (ARGB8888) pixel in memory
+BAKE_PIXEL_FORMAT = "BGRA" if sys.byteorder == "little" else "ARGB"
+
+
+def bake_key(path: str, alpha: bool, size: Optional[Tuple[int, int]]) -> str:
+    """Return the index key of one baked image"""
+    size_text = f"{size[0]}x{size[1]}" if size else "native"
+    return f"{path}|{'alpha' if alpha else 'opaque'}|{size_text}"
+
+
+def source_hash(path: str, size: Optional[Tuple[int, int]]) -> str:
+    """Hash the source file contents together with the target size"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    digest.update(repr(size).encode())
+    return digest.hexdigest()
+
+
+def atlas_hash(paths: List[str]) -> str:
+    """Hash every sprite packed into an atlas, in packing order"""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(source_hash(path, None).encode())
+    return digest.hexdigest()
+
+
+class BakedCache:
+    """Pre-scaled, pre-converted pixels memory-mapped from the bake output
+
+    Surfaces are built straight on top of the mapping with frombuffer, so
+    alpha sprites are never decoded or copied. Opaque images get one cheap
+    convert() to drop the alpha channel. An entry whose source PNG has
+    changed since the bake is ignored and the PNG is loaded instead.
+    """
+
+    def __init__(self, directory: str = BAKE_DIR):
+        self.entries: Dict[str, dict] = {}
+        self.atlas_entry: Optional[dict] = None
+        self.buffer = None
+        self.hits = 0
+        self.stale = 0
+
+        index_path = os.path.join(directory, BAKE_INDEX)
+        blob_path = os.path.join(directory, BAKE_BLOB)
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            if index.get("pixel_format") != BAKE_PIXEL_FORMAT:
+                return
+            with open(blob_path, "rb") as f:
+                if mmap:
+                    # Copy-on-write mapping: pages are only read in when first blitted
+                    self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                else:
+                    self.buffer = bytearray(f.read())
+        except (OSError, ValueError):
+            return
+        self.entries = index.get("entries", {})
+        self.atlas_entry = index.get("atlas")
+
+    def load(self, path: str, alpha: bool = True, size: Optional[Tuple[int, int]] = None) -> Optional[pygame.Surface]:
+        """Return the baked surface, or None if it is missing or stale"""
+        entry = self.entries.get(bake_key(path, alpha, size))
+        if entry is None or self.buffer is None:
+            return None
+        try:
+            if source_hash(path, size) != entry["hash"]:
+                self.stale += 1
+                return None
+        except OSError:
+            return None
+
+        surface = self._surface(entry)
+        if not alpha:
+            surface = surface.convert()
+        self.hits += 1
+        return surface
+
+    def load_atlas(self) -> Optional[TextureAtlas]:
+        """Return the baked sprite atlas, or None if it is missing or stale"""
+        entry = self.atlas_entry
+        if entry is None or self.buffer is None:
+            return None
+        try:
+            if atlas_hash(list(entry["regions"])) != entry["hash"]:
+                self.stale += 1
+                return None
+        except OSError:
+            return None
+
+        regions = {name: pygame.Rect(region) for name, region in entry["regions"].items()}
+        self.hits += 1
+        return TextureAtlas(self._surface(entry), regions)
+
+    def _surface(self, entry: dict) -> pygame.Surface:
+        """Build a surface directly on top of the mapped pixels of one entry"""
+        width, height = entry["width"], entry["height"]
+        view = memoryview(self.buffer)[entry["offset"]:entry["offset"] + width * height * 4]
+        return pygame.image.frombuffer(view, (width, height), BAKE_PIXEL_FORMAT)
+
+
+class AssetManager:
+    """Central cache for decoded images and sounds
+
+    Surfaces handed out by the manager are shared between all pooled objects
+    and must be treated as read-only. Anything that needs to draw into an
+    image should copy it first.
+    """
+
+    def __init__(self):
+        # Decoded assets, keyed by (path, alpha, size) for images and path for sounds
+        self.images: Dict[Tuple[str, bool, Optional[Tuple[int, int]]], pygame.Surface] = {}
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+
+        # Paths that failed to load, so a missing file is only tried once
+        self.failed: Dict[str, Exception] = {}
+
+        # Optional bake output, see use_baked
+        self.baked: Optional[BakedCache] = None
+
+        # Sheet the small sprites are served from, see use_atlas
+        self.atlas: Optional[TextureAtlas] = None
+
+        # Statistics
+        self.load_counts = {"image": 0, "sound": 0}
+        self.load_times = {"image": 0.0, "sound": 0.0}
+        self.cache_hits = {"image": 0, "sound": 0}
+
+    def image(self, path: str, alpha: bool = True, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+        """Return the decoded image at path, converted for the display
+
+        If size is given the image is scaled once and the scaled copy is cached
+        as well. Raises pygame.error if the file cannot be loaded.
+        """
+        key = (path, alpha, size)
+        surface = self.images.get(key)
+        if surface is not None:
+            self.cache_hits["image"] += 1
+            return surface
+
+        if self.load_baked(path, alpha, size):
+            return self.images[key]
+
+        if size is not None:
+            # Scale from the unscaled cached original
+            original = self.image(path, alpha)
+            start = time.perf_counter()
+            surface = pygame.transform.scale(original, size)
+            self.load_times["image"] += time.perf_counter() - start
+            self.images[key] = surface
+            return surface
+
+        if path in self.failed:
+            raise pygame.error(str(self.failed[path]))
+
+        start = time.perf_counter()
+        try:
+            loaded = pygame.image.load(path)
+            surface = loaded.convert_alpha() if alpha else loaded.convert()
+        except (pygame.error, FileNotFoundError) as e:
+            self.failed[path] = e
+            raise pygame.error(str(e))
+        self.load_times["image"] += time.perf_counter() - start
+        self.load_counts["image"] += 1
+
+        self.images[key] = surface
+        return surface
+
+    def use_baked(self, directory: str = BAKE_DIR) -> bool:
+        """Serve images from the bake output in directory when it is up to date"""
+        cache = BakedCache(directory)
+        self.baked = cache if cache.entries or cache.atlas_entry else None
+        if self.baked and not self.atlas:
+            atlas = self.baked.load_atlas()
+            if atlas:
+                self.use_atlas(atlas)
+        return self.baked is not None
+
+    def use_atlas(self, atlas: TextureAtlas):
+        """Serve every sprite in the atlas as a view into its sheet"""
+        self.atlas = atlas
+        for name in atlas.regions:
+            self.images[(name, True, None)] = atlas.get(name)
+        # Scaled copies made from the old individual surfaces are still valid
+
+    def load_atlas(self, paths: List[str]) -> Optional[TextureAtlas]:
+        """Pack the given sprites into an atlas unless one is already in use"""
+        if self.atlas:
+            return self.atlas
+        images = {}
+        for path in paths:
+            try:
+                images[path] = self.image(path)
+            except pygame.error:
+                continue  # Objects using it fall back to a placeholder
+        if images:
+            self.use_atlas(TextureAtlas.from_images(images))
+        return self.atlas
+
+    def load_baked(self, path: str, alpha: bool = True, size: Optional[Tuple[int, int]] = None) -> bool:
+        """Cache the baked copy of an image if there is a fresh one"""
+        if not self.baked:
+            return False
+        start = time.perf_counter()
+        surface = self.baked.load(path, alpha, size)
+        if surface is None:
+            return False
+        self.load_times["image"] += time.perf_counter() - start
+        self.load_counts["image"] += 1
+        self.images[(path, alpha, size)] = surface
+        return True
+
+    def peek(self, path: str, alpha: bool = True, size: Optional[Tuple[int, int]] = None) -> Optional[pygame.Surface]:
+        """Return the cached image if it has already been loaded, without loading it"""
+        return self.images.get((path, alpha, size))
+
+    def adopt(self, path: str, decoded: pygame.Surface, alpha: bool = True,
+              size: Optional[Tuple[int, int]] = None, seconds: float = 0.0) -> pygame.Surface:
+        """Convert an image decoded elsewhere (e.g. a worker thread) and cache it"""
+        start = time.perf_counter()
+        surface = decoded.convert_alpha() if alpha else decoded.convert()
+        self.load_times["image"] += seconds + time.perf_counter() - start
+        self.load_counts["image"] += 1
+
+        self.images[(path, alpha, size)] = surface
+        return surface
+
+    def sound(self, path: str) -> Optional[pygame.mixer.Sound]:
+        """Return the sound at path, or None if it cannot be loaded"""
+        sound = self.sounds.get(path)
+        if sound is not None:
+            self.cache_hits["sound"] += 1
+            return sound
+
+        if path in self.failed:
+            return None
+
+        start = time.perf_counter()
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Warning: Could not load sound {path}: {e}")
+            self.failed[path] = e
+            return None
+        self.load_times["sound"] += time.perf_counter() - start
+        self.load_counts["sound"] += 1
+
+        self.sounds[path] = sound
+        return sound
+
+    def stats(self) -> dict:
+        """Return load counts, cache hits and total load time per asset type"""
+        return {
+            kind: {
+                "loads": self.load_counts[kind],
+                "hits": self.cache_hits[kind],
+                "seconds": self.load_times[kind],
+            }
+            for kind in self.load_counts
+        }
+
+    def report(self) -> str:
+        """Return a one-line-per-type summary of the loads done so far"""
+        lines = []
+        for kind, stat in self.stats().items():
+            lines.append(f"{kind}: {stat['loads']} loaded, {stat['hits']} shared, "
+                         f"{stat['seconds'] * 1000:.1f} ms")
+        if self.baked:
+            lines.append(f"baked: {self.baked.hits} mapped, {self.baked.stale} stale")
+        if self.failed:
+            lines.append(f"failed: {', '.join(sorted(self.failed))}")
+        return "\n".join(lines)
+
+
+class ScaleCache:
+    """LRU cache of scaled copies of images, with the scale quantized to steps
+
+    Any scale between min_scale and max_scale maps to one of steps sizes, so
+    objects that keep changing size reuse a handful of surfaces instead of
+    calling pygame.transform.scale every frame.
+    """
+
+    def __init__(self, min_scale: float = 0.5, max_scale: float = 1.0, steps: int = 64, capacity: int = 128):
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.steps = steps
+        self.capacity = capacity
+        self.surfaces: "OrderedDict[Tuple[pygame.Surface, int], pygame.Surface]" = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, scale: float) -> int:
+        """Return the step closest to scale, clamped to the cache range"""
+        return scale_step(scale, self.min_scale, self.max_scale, self.steps)
+
+    def step_scale(self, step: int) -> float:
+        """Return the scale factor a step stands for"""
+        return step_scale(step, self.min_scale, self.max_scale, self.steps)
+
+    def get(self, image: pygame.Surface, step: int) -> pygame.Surface:
+        """Return image scaled to the given step (shared, read-only)"""
+        key = (image, step)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        scale = self.step_scale(step)
+        surface = pygame.transform.scale(image, (int(image.get_width() * scale),
+                                                 int(image.get_height() * scale)))
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def stats(self) -> dict:
+        """Return hit, miss and eviction counts and the number of cached surfaces"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.surfaces),
+        }
+
+
+def decode_image(path: str, size: Optional[Tuple[int, int]] = None):
+    """Decode (and optionally scale) an image without touching the display
+
+    Safe to call from a worker thread. Returns (surface or exception, seconds).
+    """
+    start = time.perf_counter()
+    try:
+        surface = pygame.image.load(path)
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+    except (pygame.error, FileNotFoundError) as e:
+        return e, time.perf_counter() - start
+    return surface, time.perf_counter() - start
+
+
+class AssetPreloader:
+    """Decodes a list of images in the background while frames keep being drawn
+
+    Worker threads only decode and scale. Converting to the display format
+    happens in poll, on the main thread. Without threads (pygbag) poll decodes
+    a few images per call instead, inside the normal game loop.
+    """
+
+    def __init__(self, manager: AssetManager, requests: List[Tuple[str, bool, Optional[Tuple[int, int]]]],
+                 workers: int = 4, threaded: Optional[bool] = None):
+        self.manager = manager
+        # (path, alpha, size) requests not already in the manager or its bake output
+        self.pending = [
+            request for request in requests
+            if manager.peek(*request) is None and not manager.load_baked(*request)
+        ]
+        self.total = len(self.pending)
+        self.completed = 0
+
+        self.threaded = THREADS_AVAILABLE if threaded is None else threaded
+        self.workers = workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.futures = []
+
+    @property
+    def progress(self) -> float:
+        """Fraction of requested images that are ready, from 0.0 to 1.0"""
+        if self.total == 0:
+            return 1.0
+        return self.completed / self.total
+
+    @property
+    def done(self) -> bool:
+        """True once every requested image is ready"""
+        return self.completed >= self.total
+
+    def start(self):
+        """Hand every pending image to the worker pool"""
+        if not self.threaded or not self.pending:
+            return
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preload")
+        self.futures = [
+            (request, self.executor.submit(decode_image, request[0], request[2]))
+            for request in self.pending
+        ]
+        self.pending = []
+
+    def poll(self, budget: float = 0.004) -> bool:
+        """Adopt finished images, spending about budget seconds at most
+
+        Returns True if any image became available during this call.
+        """
+        if self.done:
+            return False
+
+        adopted = False
+        deadline = time.perf_counter() + budget
+        if self.threaded:
+            still_running = []
+            for request, future in self.futures:
+                if future.done() and time.perf_counter() < deadline:
+                    self._adopt(request, *future.result())
+                    adopted = True
+                else:
+                    still_running.append((request, future))
+            self.futures = still_running
+        else:
+            # Always make progress, even if a single decode is over budget
+            while self.pending:
+                request = self.pending.pop(0)
+                self._adopt(request, *decode_image(request[0], request[2]))
+                adopted = True
+                if time.perf_counter() >= deadline:
+                    break
+
+        if self.done and self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        return adopted
+
+    def finish(self):
+        """Block until every requested image is ready"""
+        for request, future in self.futures:
+            self._adopt(request, *future.result())
+        self.futures = []
+        while self.pending:
+            request = self.pending.pop(0)
+            self._adopt(request, *decode_image(request[0], request[2]))
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def _adopt(self, request, result, seconds: float):
+        """Store one decoded image (or its failure) in the manager"""
+        path, alpha, size = request
+        self.completed += 1
+        if isinstance(result, Exception):
+            print(f"Warning: Could not preload image {path}: {result}")
+            self.manager.failed[path] = result
+            return
+        self.manager.adopt(path, result, alpha, size, seconds)
+
+
+# Shared manager for the whole process
+assets = AssetManager()
@@ -0,0 +1,81 @@
+"""
+Pinoy Skater - Sprite Atlas
+Packs the small gameplay sprites into one sheet and hands out subsurface
+views into it
+"""
+
+import pygame
+from typing import Dict, List, Tuple
+
+# Small sprites packed into the atlas
+ATLAS_SPRITES = [
+    "images/Skater.png",
+    "images/SkaterJump.png",
+    "images/SkaterSitting.png",
+    "images/Rock.png",
+    "images/Bird.png",
+    "images/Coin.png",
+    "images/Candy.png",
+    "images/Heart.png",
+    "images/Hit.png",
+]
+
+# Sheet width and the transparent gap left between sprites
+ATLAS_WIDTH = 512
+ATLAS_PADDING = 1
+
+
+def pack_regions(sizes: Dict[str, Tuple[int, int]], max_width: int = ATLAS_WIDTH,
+                 padding: int = ATLAS_PADDING) -> Tuple[Dict[str, pygame.Rect], Tuple[int, int]]:
+    """Place each (width, height) on shelves, tallest first
+
+    Returns the region of every name and the size of the sheet needed.
+    """
+    regions = {}
+    x = y = shelf_height = sheet_width = 0
+    for name, (width, height) in sorted(sizes.items(), key=lambda entry: (-entry[1][1], entry[0])):
+        if x > 0 and x + width > max_width:
+            # Start a new shelf below the tallest sprite of this one
+            y += shelf_height + padding
+            x = shelf_height = 0
+        regions[name] = pygame.Rect(x, y, width, height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+        sheet_width = max(sheet_width, x - padding)
+    return regions, (sheet_width, y + shelf_height)
+
+
+class TextureAtlas:
+    """One sheet surface plus the region of every sprite packed into it"""
+
+    def __init__(self, sheet: pygame.Surface, regions: Dict[str, pygame.Rect]):
+        self.sheet = sheet
+        self.regions = regions
+        self.views: Dict[str, pygame.Surface] = {}
+
+    @classmethod
+    def from_images(cls, images: Dict[str, pygame.Surface]) -> "TextureAtlas":
+        """Pack already loaded images into a new sheet"""
+        regions, size = pack_regions({name: image.get_size() for name, image in images.items()})
+        sheet = pygame.Surface(size, pygame.SRCALPHA)
+        for name, image in images.items():
+            sheet.blit(image, regions[name])
+        if pygame.display.get_surface():
+            sheet = sheet.convert_alpha()
+        return cls(sheet, regions)
+
+    @classmethod
+    def from_files(cls, paths: List[str]) -> "TextureAtlas":
+        """Decode each file and pack it (no display needed)"""
+        return cls.from_images({path: pygame.image.load(path) for path in paths})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.regions
+
+    def get(self, name: str) -> pygame.Surface:
+        """Return a subsurface view of one sprite, sharing the sheet's pixels"""
+        view = self.views.get(name)
+        if view is None:
+            view = self.sheet.subsurface(self.regions[name])
+            self.views[name] = view
+        return view
@@ -0,0 +1,96 @@
+"""
+Pinoy Skater - Asset Baker
+Writes every preloaded image, already scaled and in display pixel format,
+to one uncompressed cache file that the game memory-maps at startup. The
+small sprites go in as a single packed atlas, which is also saved as a PNG
+for the Arcade version.
+
+Usage: python bake.py [output_dir]
+"""
+
+import json
+import os
+import sys
+import time
+import pygame
+
+from assets import BAKE_BLOB, BAKE_DIR, BAKE_INDEX, BAKE_PIXEL_FORMAT, atlas_hash, bake_key, source_hash
+from atlas import ATLAS_SPRITES, TextureAtlas
+from main import PRELOAD_IMAGES
+
+# Sheet and regions read by pinoy-skater_4.py
+ARCADE_ATLAS_IMAGE = "atlas.png"
+ARCADE_ATLAS_INDEX = "atlas.json"
+
+
+def bake(requests, directory: str = BAKE_DIR, atlas_paths=ATLAS_SPRITES) -> dict:
+    """Decode, scale and store each (path, alpha, size) request; return the index
+
+    Sprites listed in atlas_paths are stored once, packed into the atlas.
+    """
+    os.makedirs(directory, exist_ok=True)
+    entries = {}
+    atlas_entry = None
+    offset = 0
+
+    blob_path = os.path.join(directory, BAKE_BLOB)
+    with open(blob_path + ".tmp", "wb") as blob:
+        if atlas_paths:
+            atlas = TextureAtlas.from_files(atlas_paths)
+            pixels = pygame.image.tobytes(atlas.sheet, BAKE_PIXEL_FORMAT)
+            blob.write(pixels)
+            regions = {name: list(region) for name, region in atlas.regions.items()}
+            atlas_entry = {
+                "hash": atlas_hash(list(regions)),
+                "offset": offset,
+                "width": atlas.sheet.get_width(),
+                "height": atlas.sheet.get_height(),
+                "regions": regions,
+            }
+            offset += len(pixels)
+
+            # The Arcade version slices its textures out of the same sheet
+            pygame.image.save(atlas.sheet, os.path.join(directory, ARCADE_ATLAS_IMAGE))
+            with open(os.path.join(directory, ARCADE_ATLAS_INDEX), "w") as f:
+                json.dump({"regions": regions}, f, indent=2)
+
+        for path, alpha, size in requests:
+            if atlas_entry and path in atlas_entry["regions"]:
+                continue  # Already stored in the atlas
+            try:
+                surface = pygame.image.load(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Warning: Skipping {path}: {e}")
+                continue
+            if size is not None:
+                surface = pygame.transform.scale(surface, size)
+
+            pixels = pygame.image.tobytes(surface, BAKE_PIXEL_FORMAT)
+            blob.write(pixels)
+            entries[bake_key(path, alpha, size)] = {
+                "hash": source_hash(path, size),
+                "offset": offset,
+                "width": surface.get_width(),
+                "height": surface.get_height(),
+            }
+            offset += len(pixels)
+
+    index = {"pixel_format": BAKE_PIXEL_FORMAT, "entries": entries, "atlas": atlas_entry}
+    os.replace(blob_path + ".tmp", blob_path)
+    with open(os.path.join(directory, BAKE_INDEX), "w") as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else BAKE_DIR
+    start = time.perf_counter()
+    index = bake(PRELOAD_IMAGES, directory)
+    size = os.path.getsize(os.path.join(directory, BAKE_BLOB))
+    sprites = len(index["atlas"]["regions"]) if index["atlas"] else 0
+    print(f"Baked {len(index['entries'])} images and a {sprites}-sprite atlas "
+          f"({size / 1e6:.1f} MB) to {directory} in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Pinoy Skater - Balancing
+Plays thousands of seeded headless games with a scripted bot at every
+point of a grid of difficulty settings, on all cores, and streams the
+survival time and score distributions of each point to a JSON lines file.
+Points already in the file are skipped, so an interrupted sweep resumes
+where it stopped.
+
+Usage: python balance.py [--obstacle-interval S ...] [--object-speed P ...] [--games N] [--out FILE]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+from simulation import DIFFICULTY, TICK_RATE, autopilot, check_difficulty, percentile, run_headless
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Games played by one worker task; large enough that process overhead does not matter
+CHUNK_GAMES = 50
+
+
+def play_games(difficulty: Dict[str, float], seeds: List[int], frames: int, tick_rate: int,
+               bot: bool) -> List[Tuple[float, int]]:
+    """(seconds survived, score) of one game per seed (runs in a worker process)"""
+    results = []
+    for seed in seeds:
+        # Without the bot nothing acts between events, so idle ticks can be skipped
+        result = run_headless(frames, seed, policy=autopilot if bot else None, tick_rate=tick_rate,
+                              fast=not bot, difficulty=difficulty)
+        results.append((result["game_time"], result["score"]))
+    return results
+
+
+def distribution(values: List[float]) -> dict:
+    """Mean, percentiles and extremes of values"""
+    summary = {"mean": sum(values) / len(values), "min": min(values), "max": max(values)}
+    summary.update((f"p{percent}", percentile(values, percent)) for percent in PERCENTILES)
+    return summary
+
+
+def point_key(difficulty: Dict[str, float]) -> str:
+    """Identifies a grid point in the results file"""
+    return json.dumps(difficulty, sort_keys=True)
+
+
+def finished_points(path: str, settings: dict) -> set:
+    """Keys of the points already in the results file that were run with the same settings"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as results:
+        for line in results:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Cut short by an interrupted write
+            if record.get("settings") == settings:
+                done.add(point_key(record["difficulty"]))
+    return done
+
+
+def grid(values: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """Every combination of the values of each difficulty setting"""
+    names = list(values)
+    return [dict(zip(names, map(float, combination))) for combination in itertools.product(*values.values())]
+
+
+def sweep(points: List[Dict[str, float]], games: int, frames: int, seed: int, tick_rate: int, bot: bool,
+          out: str, workers: int = None):
+    """Play games games at every point not yet in out, appending one line per finished point
+
+    Raises ValueError before playing anything if a point is not a valid difficulty.
+    """
+    for difficulty in points:
+        check_difficulty(difficulty)
+    settings = {"games": games, "frames": frames, "seed": seed, "tick_rate": tick_rate, "bot": bot}
+    done = finished_points(out, settings)
+    pending = [difficulty for difficulty in points if point_key(difficulty) not in done]
+    print(f"{len(points)} points, {len(points) - len(pending)} already in {out}, {len(pending)} to play")
+    if not pending:
+        return
+
+    # Every point plays the same seeds, so differences between points are not luck
+    seeds = list(range(seed, seed + games))
+    chunks = [seeds[start:start + CHUNK_GAMES] for start in range(0, games, CHUNK_GAMES)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as executor, open(out, "a") as results:
+        tasks = {}
+        for index, difficulty in enumerate(pending):
+            for chunk in chunks:
+                task = executor.submit(play_games, difficulty, chunk, frames, tick_rate, bot)
+                tasks[task] = index
+        played: Dict[int, List[Tuple[float, int]]] = {index: [] for index in range(len(pending))}
+
+        try:
+            for finished, task in enumerate(as_completed(tasks), 1):
+                index = tasks[task]
+                played[index].extend(task.result())
+                if len(played[index]) < games:
+                    continue
+                times, scores = zip(*played.pop(index))
+                record = {
+                    "difficulty": pending[index],
+                    "settings": settings,
+                    "survival": distribution(times),
+                    "score": distribution(scores),
+                    "survived": sum(round(seconds * tick_rate) >= frames for seconds in times) / games,
+                }
+                results.write(json.dumps(record) + "\n")
+                results.flush()
+                print(f"[{finished}/{len(tasks)} tasks, {time.perf_counter() - start:.0f} s] {pending[index]}: "
+                      f"median {record['survival']['p50']:.1f} s, score {record['score']['p50']:g}")
+        except KeyboardInterrupt:
+            # Finished points are already written; the same command picks up the rest
+            executor.shutdown(wait=False, cancel_futures=True)
+            print(f"Interrupted, run again to resume from {out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinoy Skater difficulty balancing")
+    for name, default in DIFFICULTY.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=float, nargs="+", default=[default],
+                            help=f"values to try (default {default:g})")
+    parser.add_argument("--games", type=int, default=1000, help="games to play at every point")
+    parser.add_argument("--frames", type=int, default=TICK_RATE * 300,
+                        help="ticks after which a game counts as survived")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation ticks per second")
+    parser.add_argument("--no-bot", action="store_true", help="let the games play without any input")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--out", default="balance.jsonl", help="results file, appended to and resumed from")
+    args = parser.parse_args()
+
+    for name in ("games", "frames", "tick_rate"):
+        if getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be positive")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be positive")
+
+    points = grid({name: getattr(args, name) for name in DIFFICULTY})
+    # Catch a bad point here rather than in a worker process halfway through the sweep
+    for point in points:
+        try:
+            check_difficulty(point)
+        except ValueError as error:
+            parser.error(f"invalid grid point {point_key(point)}: {error}")
+    sweep(points, args.games, args.frames, args.seed, args.tick_rate, not args.no_bot, args.out, args.workers)
+
+
+if __name__ == "__main__":
+    main()
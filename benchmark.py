@@ -0,0 +1,134 @@
+"""
+Pinoy Skater - Benchmarks
+Times the per-frame hot paths of main.py on a hidden display
+
+Usage: python benchmark.py [frames]
+"""
+
+import os
+import sys
+import time
+
+# Run without a window or sound card unless the caller picked drivers
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from assets import assets
+from main import FPS, SCREEN_HEIGHT, SCREEN_WIDTH, WHITE, GameState, PinoySkaterGame
+from render import NUMPY_AVAILABLE
+
+
+def time_per_frame(func, frames: int) -> float:
+    """Call func(frame) for every frame and return the mean cost in microseconds"""
+    start = time.perf_counter()
+    for frame in range(frames):
+        func(frame)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def bench_hud(game: PinoySkaterGame, frames: int) -> dict:
+    """HUD cost per frame, with the score changing every 30 frames"""
+    surface = game.screen
+
+    def immediate(frame):
+        # What draw_game_screen used to do every frame
+        score = frame // 30 * 100
+        for i, rect in enumerate(game.heart_rects):
+            if i < game.lives:
+                surface.blit(game.heart_image, rect)
+        text = game.small_font.render(f"Score: {score}", True, WHITE)
+        surface.blit(text, (10, SCREEN_HEIGHT - 70))
+
+    def retained(frame):
+        game.hud.update(frame // 30 * 100, game.lives)
+        game.hud.draw(surface)
+
+    return {
+        "hud (font.render every frame)": time_per_frame(immediate, frames),
+        "hud (retained glyph atlas)": time_per_frame(retained, frames),
+    }
+
+
+def bench_play_frames(game: PinoySkaterGame, frames: int) -> dict:
+    """Update plus draw of the PLAYING screen, full redraw vs dirty rects"""
+    results = {}
+    for label, dirty in (("play frame (full redraw)", False), ("play frame (dirty rects)", True)):
+        game.setup_game(seed=0)
+        game.game_state = GameState.PLAYING
+        game.use_dirty_rects = dirty
+
+        def frame_step(frame):
+            game.update(1 / FPS)
+            game.draw()
+            if game.game_state != GameState.PLAYING:
+                game.setup_game(seed=frame)
+                game.game_state = GameState.PLAYING
+
+        results[label] = time_per_frame(frame_step, frames)
+    game.use_dirty_rects = True
+    return results
+
+
+def bench_static_screens(game: PinoySkaterGame, frames: int) -> dict:
+    """Draw cost of the START, INSTRUCTIONS and GAME_OVER screens"""
+    results = {}
+    for state in (GameState.START, GameState.INSTRUCTIONS, GameState.GAME_OVER):
+        game.game_state = state
+        results[f"{state.name.lower()} screen"] = time_per_frame(lambda frame: game.draw(), frames)
+    return results
+
+
+def bench_pixels(game: PinoySkaterGame, frames: int) -> dict:
+    """Cost of getting the pixels of one play frame to an agent"""
+    results = {}
+    game.setup_game(seed=0)
+    game.game_state = GameState.PLAYING
+
+    def copied(frame):
+        game.update(1 / FPS)
+        game.draw()
+        pygame.image.tobytes(game.screen, "RGB")
+
+    results["pixels (draw + image.tobytes)"] = time_per_frame(copied, frames)
+    for label, size, grayscale in (("full size", None, False),
+                                   ("300x175 gray", (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 4), True)):
+        game.set_pixel_observation(size, grayscale)
+        # Held across frames, as an agent holds its last observation
+        held = {}
+
+        def observed(frame):
+            game.update(1 / FPS)
+            held["observation"] = game.observe_pixels()
+
+        results[f"pixels (observe_pixels, {label})"] = time_per_frame(observed, frames)
+    game.observer = None
+    return results
+
+
+def run(frames: int = 600) -> dict:
+    """Run every benchmark and return {name: microseconds per frame}"""
+    game = PinoySkaterGame()
+    game.setup_game(seed=0)
+
+    results = {}
+    results.update(bench_hud(game, frames))
+    results.update(bench_play_frames(game, frames))
+    results.update(bench_static_screens(game, frames))
+    if NUMPY_AVAILABLE:
+        results.update(bench_pixels(game, frames))
+    return results
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    results = run(frames)
+    width = max(len(name) for name in results)
+    for name, micros in results.items():
+        print(f"{name:<{width}}  {micros:9.1f} us/frame")
+    print(f"\nAssets:\n{assets.report()}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ echo "Installing dependencies..."
 pip install -r requirements.txt
 pip install pyinstaller
 
+echo "Baking sprite atlas..."
+python bake.py
+
 echo "Building executable for Pinoy Skater (Arcade version)..."
 pyinstaller pinoy-skater_4.spec
 
@@ -0,0 +1,56 @@
+"""
+Pinoy Skater - Fast-Forward Check
+Plays games at several seeds and tick rates both tick by tick and
+fast-forwarded over idle ticks, with Simulation and (when NumPy is
+installed) VectorSimulation, and fails unless every pair ends in exactly
+the same state. Run by CI on every push.
+
+Usage: python check_fast.py [--seeds N ...] [--tick-rates N ...] [--frames N]
+"""
+
+import argparse
+import sys
+from typing import List
+
+from entity_store import NUMPY_AVAILABLE, VectorSimulation
+from simulation import Simulation, check_fast_forward
+
+SEEDS = (1, 2, 3, 7, 42)
+TICK_RATES = (30, 60, 120)
+FRAMES = 20000
+
+
+def simulations() -> List[type]:
+    """Every simulation class that can run here"""
+    return [Simulation, VectorSimulation] if NUMPY_AVAILABLE else [Simulation]
+
+
+def check(seeds=SEEDS, tick_rates=TICK_RATES, frames: int = FRAMES, classes: List[type] = None) -> bool:
+    """Print one line per game compared and return whether all of them matched"""
+    ok = True
+    for simulation in classes or simulations():
+        for tick_rate in tick_rates:
+            for seed in seeds:
+                for result in check_fast_forward(seed, frames, tick_rate, simulation):
+                    verdict = "same" if result["match"] else "DIFFERENT"
+                    print(f"{simulation.__name__} {tick_rate} Hz seed {seed} {result['game']}: "
+                          f"{result['frames']} frames, {verdict} end state, "
+                          f"{result['speedup']:.1f}x faster fast-forwarded")
+                    ok = ok and result["match"]
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinoy Skater fast-forward check")
+    parser.add_argument("--seeds", type=int, nargs="+", default=SEEDS, help="game seeds to play")
+    parser.add_argument("--tick-rates", type=int, nargs="+", default=TICK_RATES, help="tick rates to play at")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="most ticks per game")
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("numpy not installed, checking Simulation only")
+    sys.exit(0 if check(args.seeds, args.tick_rates, args.frames) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Pinoy Skater - Entity Store
+Keeps every obstacle and item of the simulation in parallel NumPy arrays, so
+movement, off-screen recycling and collisions are each one vectorized
+operation however many entities there are. Needs numpy; the game itself
+runs without it.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional, only for large headless runs
+    np = None
+
+from simulation import (ENTITY_KINDS, ITEM_KINDS, MAX_LIVES, OBSTACLE_KINDS, ROCK_MAX_SCALE, ROCK_MIN_SCALE,
+                        SCREEN_HEIGHT, SCREEN_WIDTH, Simulation, despawn_x, scale_step, step_scale,
+                        weighted_kind)
+
+NUMPY_AVAILABLE = np is not None
+
+# Small integer id of every entity kind, as stored in EntityStore.kind
+KIND_IDS = {kind: index for index, kind in enumerate(ENTITY_KINDS)}
+ENTITY_KINDS_BY_ID = list(ENTITY_KINDS)
+
+# Every column of an EntityStore, and those that change during a game
+COLUMNS = ("kind", "lane_y", "points", "health", "base_width", "base_height", "width", "height",
+           "scale_step", "despawn_x", "x", "previous_x", "speed", "active")
+STATE_COLUMNS = ("width", "height", "scale_step", "x", "previous_x", "speed", "active")
+
+
+class EntityStore:
+    """Every pooled entity as one row of a set of parallel arrays
+
+    Rows never move, so a row index identifies an entity for its whole life.
+    """
+
+    def __init__(self, kinds: List[str], sizes: Dict[str, Tuple[int, int]]):
+        self.sizes = sizes
+        self.kind = np.array([KIND_IDS[kind] for kind in kinds], dtype=np.int8)
+        self.lane_y = np.array([ENTITY_KINDS[kind][0] for kind in kinds], dtype=np.int64)
+        self.points = np.array([ENTITY_KINDS[kind][1] for kind in kinds], dtype=np.int64)
+        self.health = np.array([ENTITY_KINDS[kind][2] for kind in kinds], dtype=np.int64)
+
+        self.base_width = np.array([sizes[kind][0] for kind in kinds], dtype=np.int64)
+        self.base_height = np.array([sizes[kind][1] for kind in kinds], dtype=np.int64)
+        self.width = self.base_width.copy()
+        self.height = self.base_height.copy()
+        self.scale_step = np.full(len(kinds), -1, dtype=np.int64)  # -1 until first scaled
+        self.despawn_x = np.array([despawn_x(kind, sizes) for kind in kinds], dtype=np.int64)
+
+        self.x = np.full(len(kinds), float(SCREEN_WIDTH))
+        self.previous_x = self.x.copy()
+        self.speed = np.zeros(len(kinds))
+        self.active = np.zeros(len(kinds), dtype=bool)
+        self.update_masks()
+
+    def update_masks(self):
+        """Recompute the per-kind masks after rows were added"""
+        self.is_rock = self.kind == KIND_IDS["rock"]
+        self.is_obstacle = np.isin(self.kind, [KIND_IDS[kind] for kind in OBSTACLE_KINDS])
+        self.is_item = np.isin(self.kind, [KIND_IDS[kind] for kind in ITEM_KINDS])
+
+    def append(self, kind: str) -> int:
+        """Add one inactive row of kind and return its index"""
+        row = EntityStore([kind], self.sizes)
+        for name in COLUMNS:
+            setattr(self, name, np.concatenate((getattr(self, name), getattr(row, name))))
+        self.update_masks()
+        return len(self) - 1
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def reset(self, rows=slice(None)):
+        """Return rows to the right edge, inactive"""
+        self.x[rows] = SCREEN_WIDTH
+        self.previous_x[rows] = SCREEN_WIDTH
+        self.active[rows] = False
+
+    def spawn(self, row: int):
+        """Enter one row at the right edge"""
+        self.reset(row)
+        self.active[row] = True
+
+    def set_scale(self, rows, scale_factor: float):
+        """Resize rock rows to the quantized step of scale_factor (same sizes as Entity.set_scale)"""
+        step = scale_step(scale_factor)
+        rows = np.asarray(rows).reshape(-1)
+        rows = rows[self.is_rock[rows] & (self.scale_step[rows] != step)]
+        if len(rows):
+            scale = step_scale(step)
+            self.scale_step[rows] = step
+            self.width[rows] = (self.base_width[rows] * scale).astype(np.int64)
+            self.height[rows] = (self.base_height[rows] * scale).astype(np.int64)
+
+    def move(self, speed: float):
+        """Move every active row speed pixels left"""
+        active = self.active
+        self.speed[active] = speed
+        self.previous_x[active] = self.x[active]
+        self.x[active] -= speed
+
+    def lefts(self) -> "np.ndarray":
+        """Left edges in whole pixels, truncated like Entity.box"""
+        return np.trunc(self.x).astype(np.int64)
+
+    def swept_hits(self, hitbox: Tuple[int, int, int, int], player_dy: int) -> "np.ndarray":
+        """Mask of active rows that overlapped hitbox at any time during the last tick
+
+        The vectorized form of simulation.swept_collide, giving the same answer row by row.
+        """
+        hits = np.zeros(len(self), dtype=bool)
+        if hitbox[2] <= 0 or hitbox[3] <= 0:
+            return hits
+
+        # Rows only move left, so only those whose x-range over the tick (left edge now
+        # to right edge before) reaches into the hitbox can have touched it
+        left = self.lefts()
+        start = np.trunc(self.previous_x).astype(np.int64)
+        near = np.flatnonzero(self.active & (left < hitbox[0] + hitbox[2]) & (start + self.width > hitbox[0]))
+        if not len(near):
+            return hits
+
+        width = self.width[near]
+        height = self.height[near]
+        top = SCREEN_HEIGHT - self.lane_y[near] - height
+        enter = np.zeros(len(near))
+        leave = np.ones(len(near))
+        for position, size, move, a_position, a_size in (
+                (left[near], width, left[near] - start[near], hitbox[0], hitbox[2]),
+                (top, height, np.full(len(near), -player_dy, dtype=np.int64), hitbox[1], hitbox[3])):
+            start_position = position - move
+            low = a_position - size  # A row overlaps the hitbox while low < position < high
+            high = a_position + a_size
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t1 = (low - start_position) / move
+                t2 = (high - start_position) / move
+            # A row that did not move on this axis overlaps always or never
+            still = move == 0
+            static_overlap = (low < start_position) & (start_position < high)
+            enter = np.maximum(enter, np.where(still, np.where(static_overlap, 0.0, 1.0), np.minimum(t1, t2)))
+            leave = np.minimum(leave, np.where(still, np.where(static_overlap, 1.0, 0.0), np.maximum(t1, t2)))
+
+        hits[near] = (width > 0) & (height > 0) & (enter < leave)
+        return hits
+
+    def offscreen(self) -> "np.ndarray":
+        """Mask of active rows far enough off the left edge to be recycled (see simulation.despawn_x)"""
+        return self.active & (self.lefts() <= self.despawn_x)
+
+    def box(self, row: int) -> Tuple[int, int, int, int]:
+        """(left, top, width, height) of one row, like Entity.box"""
+        return (int(np.trunc(self.x[row])), int(SCREEN_HEIGHT - self.lane_y[row] - self.height[row]),
+                int(self.width[row]), int(self.height[row]))
+
+
+class VectorSimulation(Simulation):
+    """Simulation with its entities in an EntityStore
+
+    Plays exactly the same game as Simulation for the same seed and inputs,
+    but the per-tick cost stays nearly flat as the pools grow into the
+    thousands. Events carry the row index of the entity instead of an Entity.
+    """
+
+    def build_entities(self, pool_sizes: Dict[str, int], pool_limits: Dict[str, int]):
+        """Create one store row per pooled entity, kind by kind, with a free list of rows per kind"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("VectorSimulation needs numpy (pip install numpy)")
+        kinds = OBSTACLE_KINDS + ITEM_KINDS + ("heart",)
+        self.store = EntityStore([kind for kind in kinds for _ in range(pool_sizes[kind])], self.sizes)
+
+        # Rows of every kind in creation order, and how many rows each kind may grow to
+        self.pool_rows: Dict[str, List[int]] = {kind: [] for kind in kinds}
+        for row, kind_id in enumerate(self.store.kind):
+            self.pool_rows[ENTITY_KINDS_BY_ID[kind_id]].append(row)
+        self.pool_limits = {kind: max(pool_limits[kind], pool_sizes[kind]) for kind in kinds}
+        self.update_rows()
+
+        # Entity lists of Simulation, unused here
+        self.obstacles = []
+        self.items = []
+        self.heart = None
+
+    def update_rows(self):
+        """Refresh the row index arrays after the store grew"""
+        self.obstacle_rows = np.flatnonzero(self.store.is_obstacle)
+        self.rock_rows = np.flatnonzero(self.store.is_rock)
+
+    def reset_entities(self):
+        """Take every row off screen and free it"""
+        self.store.reset()
+        self.free_rows = {kind: rows[::-1] for kind, rows in self.pool_rows.items()}
+        self.active_counts = {kind: 0 for kind in self.pool_rows}
+        self.peaks = {kind: 0 for kind in self.pool_rows}
+        self.scale_rocks(ROCK_MIN_SCALE)  # Rocks start at 50% size
+
+    def acquire(self, kind: str) -> Optional[int]:
+        """Spawn a free row of kind at the right edge, growing the store if needed (like EntityPool.acquire)"""
+        if self.free_rows[kind]:
+            row = self.free_rows[kind].pop()
+        elif len(self.pool_rows[kind]) < self.pool_limits[kind]:
+            row = self.store.append(kind)
+            self.pool_rows[kind].append(row)
+            self.update_rows()
+            if kind == "rock":
+                self.store.set_scale(row, self.rock_scale)
+        else:
+            return None
+        self.store.spawn(row)
+        self.active_counts[kind] += 1
+        self.peaks[kind] = max(self.peaks[kind], self.active_counts[kind])
+        return row
+
+    def release_rows(self, rows: "np.ndarray"):
+        """Take active rows off screen and free them, in row order"""
+        self.store.reset(rows)
+        for row in rows:
+            kind = ENTITY_KINDS_BY_ID[self.store.kind[row]]
+            self.free_rows[kind].append(int(row))
+            self.active_counts[kind] -= 1
+
+    def entity_states(self) -> List[tuple]:
+        """(kind, x, previous_x, width, height) of every active row, sorted (like Simulation's)"""
+        store = self.store
+        return sorted((ENTITY_KINDS_BY_ID[store.kind[row]], float(store.x[row]), float(store.previous_x[row]),
+                       int(store.width[row]), int(store.height[row])) for row in np.flatnonzero(store.active))
+
+    def snapshot_entities(self) -> tuple:
+        """Copies of the changing store columns, the free lists and the pool counters, for snapshot()"""
+        store = self.store
+        return (len(store), tuple(getattr(store, name).copy() for name in STATE_COLUMNS),
+                tuple((kind, tuple(rows)) for kind, rows in self.free_rows.items()),
+                tuple(self.active_counts.items()), tuple(self.peaks.items()))
+
+    def restore_entities(self, entities: tuple):
+        """Undo everything that happened to the rows since snapshot_entities(), including store growth"""
+        size, columns, free_rows, active_counts, peaks = entities
+        store = self.store
+        if len(store) > size:
+            for name in COLUMNS:
+                setattr(store, name, getattr(store, name)[:size].copy())
+            store.update_masks()
+            for rows in self.pool_rows.values():
+                rows[:] = [row for row in rows if row < size]
+            self.update_rows()
+        for name, column in zip(STATE_COLUMNS, columns):
+            getattr(store, name)[:] = column
+        self.free_rows = {kind: list(rows) for kind, rows in free_rows}
+        self.active_counts = dict(active_counts)
+        self.peaks = dict(peaks)
+
+    def pool_stats(self) -> Dict[str, Tuple[int, int]]:
+        """(rows allocated, most active at once) of every kind"""
+        return {kind: (len(rows), self.peaks[kind]) for kind, rows in self.pool_rows.items()}
+
+    def scale_rocks(self, scale_factor: float):
+        """Resize every rock"""
+        self.rock_scale = scale_factor
+        self.store.set_scale(self.rock_rows, scale_factor)
+
+    def move_entities(self, speed: float):
+        """Move every active row speed pixels left"""
+        self.store.move(speed)
+
+    def entity_idle_ticks(self, limit: int, speed: float, hitbox: Tuple[int, int, int, int]) -> int:
+        """Ticks, at most limit, before any row could be recycled or reach hitbox (like Simulation's)"""
+        store = self.store
+        active = store.active
+        if not active.any():
+            return max(limit, 0)
+        x = store.x[active]
+        limit = min(limit, int(np.floor((x - store.despawn_x[active]) / speed).min()) - 1)
+        # Rows level with the player and not yet past it, at their base size
+        bottom = SCREEN_HEIGHT - store.lane_y[active]
+        near = ((store.lefts()[active] + store.base_width[active] > hitbox[0])
+                & (bottom - store.base_height[active] < hitbox[1] + hitbox[3]) & (hitbox[1] < bottom))
+        if near.any():
+            limit = min(limit, int(np.floor((x[near] - (hitbox[0] + hitbox[2])) / speed).min()) - 1)
+        return max(limit, 0)
+
+    def skip_entities(self, ticks: int, speed: float):
+        """Move every active row ticks times speed pixels left"""
+        store = self.store
+        active = store.active
+        store.speed[active] = speed
+        store.previous_x[active] = store.x[active] - (ticks - 1) * speed
+        store.x[active] -= ticks * speed
+
+    def next_obstacle(self, left: int, right: int) -> Optional[Tuple[float, bool]]:
+        """(x, is_rock) of the leftmost active obstacle overlapping left..right, if any"""
+        store = self.store
+        rows = self.obstacle_rows
+        x = store.x[rows]
+        near = store.active[rows] & (left - store.width[rows] < x) & (x < right)
+        if not near.any():
+            return None
+        row = rows[near][np.argmin(x[near])]
+        return float(store.x[row]), bool(store.is_rock[row])
+
+    def spawn_obstacle(self):
+        """Spawn a random obstacle"""
+        row = self.acquire(weighted_kind(self.rngs["obstacles"], OBSTACLE_KINDS, self.obstacle_weights))
+
+        # After 1 minute, assign random size to rocks for variety
+        if row is not None and self.store.is_rock[row] and self.time_elapsed >= self.difficulty["rock_growth_time"]:
+            self.store.set_scale(row, self.rngs["rocks"].uniform(ROCK_MIN_SCALE, ROCK_MAX_SCALE))
+
+    def spawn_item(self):
+        """Spawn a random item"""
+        self.acquire(weighted_kind(self.rngs["items"], ITEM_KINDS, self.item_weights))
+
+    def spawn_heart(self):
+        """Spawn the heart (rare health item) unless it is already out"""
+        self.acquire("heart")
+
+    def check_collisions(self) -> List[Tuple[str, int]]:
+        """Apply every collision of the last tick in one pass over the store"""
+        store = self.store
+        hits = store.swept_hits(self.player.hitbox(), self.player.moved_y)
+        # Recycle whatever left the screen without touching the player
+        recycled = store.offscreen() & ~hits
+
+        events = []
+        if hits.any():
+            obstacle_hits = np.flatnonzero(hits & store.is_obstacle)
+            self.lives -= len(obstacle_hits)
+            events.extend(("hit", int(row)) for row in obstacle_hits)
+
+            # Items, then the heart, as Simulation reports them
+            collected = np.flatnonzero(hits & store.is_item)
+            hearts = [row for row in self.pool_rows["heart"] if hits[row]]
+            self.score += int(store.points[collected].sum()) + int(store.points[hearts].sum())
+            for row in hearts:
+                # Restore health
+                self.lives = min(self.lives + int(store.health[row]), MAX_LIVES)
+            events.extend(("collect", int(row)) for row in collected)
+            events.extend(("collect", row) for row in hearts)
+
+        released = np.flatnonzero(hits | recycled)
+        if len(released):
+            self.release_rows(released)
+        return events
@@ -0,0 +1,103 @@
+"""
+Pinoy Skater - Environment
+A Gym-style reset / step interface over the game rules, with compact
+vector observations, for training and evaluating autopilots (attract mode,
+QA bots). Runs without a display or pygame.
+"""
+
+from array import array
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional; observations are then array.array("f")
+    np = None
+
+from simulation import (ENTITY_KINDS, HITBOX_MARGIN_X, INITIAL_OBJECT_SPEED, INPUT_ACTIONS, JUMP_DURATION,
+                        JUMP_HEIGHT, PLAYER_Y, SCREEN_WIDTH, TICK_RATE, Simulation)
+
+NUMPY_AVAILABLE = np is not None
+
+# Action index -> player input; 0 does nothing
+ACTIONS = ("noop",) + INPUT_ACTIONS
+
+# Lanes from the ground up, as they appear in observations
+LANES = sorted({lane_y for lane_y, _, _ in ENTITY_KINDS.values()})
+# Kind of an entity as an observed value in (0, 1]; 0 is an empty slot
+KIND_CODES = {kind: (index + 1) / len(ENTITY_KINDS) for index, kind in enumerate(ENTITY_KINDS)}
+
+# Score lost (or gained) per life lost (or gained), in the reward
+LIFE_VALUE = 500
+
+# Floats per player and per entity slot in an observation
+PLAYER_FEATURES = 4
+ENTITY_FEATURES = 3
+
+
+class SkaterEnv:
+    """One game behind reset(seed) and step(action), Gymnasium style
+
+    An observation is a fixed-size float32 array: the player's height,
+    whether it is jumping or sitting and how far through the jump it is,
+    then for every lane the nearest per_lane entities not yet past the
+    player, each as (distance / screen width, kind, speed multiplier).
+    Empty slots read (1, 0, 0). The reward of a step is the score gained
+    plus LIFE_VALUE per life gained, minus LIFE_VALUE per life lost.
+    """
+
+    def __init__(self, per_lane: int = 2, tick_rate: int = TICK_RATE, max_frames: Optional[int] = None,
+                 life_value: float = LIFE_VALUE):
+        self.per_lane = per_lane
+        self.max_frames = max_frames
+        self.life_value = life_value
+        self.sim = Simulation(tick_rate=tick_rate, seed=0)
+        self.observation_size = PLAYER_FEATURES + len(LANES) * per_lane * ENTITY_FEATURES
+        self.action_count = len(ACTIONS)
+
+        # Distances are measured from the player's hitbox
+        self.player_left = self.sim.player.x + HITBOX_MARGIN_X
+        self.base_speed = INITIAL_OBJECT_SPEED * self.sim.speed_scale
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[object, dict]:
+        """Start a new game and return (observation, info)"""
+        self.sim.reset(seed)
+        return self.observation(), {"seed": self.sim.seed}
+
+    def step(self, action: int) -> Tuple[object, float, bool, bool, dict]:
+        """Apply an action, run one tick and return (observation, reward, terminated, truncated, info)"""
+        sim = self.sim
+        if action:
+            sim.input(ACTIONS[action])
+        score = sim.score
+        lives = sim.lives
+        events = sim.step()
+
+        reward = sim.score - score + (sim.lives - lives) * self.life_value
+        terminated = sim.game_over
+        truncated = not terminated and self.max_frames is not None and sim.frames >= self.max_frames
+        info = {"score": sim.score, "lives": sim.lives, "frames": sim.frames, "events": len(events)}
+        return self.observation(), reward, terminated, truncated, info
+
+    def observation(self):
+        """The current state as a fixed-size float array"""
+        player = self.sim.player
+        values: List[float] = [
+            (player.y - PLAYER_Y) / JUMP_HEIGHT,
+            float(player.is_jumping),
+            float(player.is_sitting),
+            player.jump_timer / JUMP_DURATION,
+        ]
+        left = self.player_left
+        for lane_y in LANES:
+            found = 0
+            for entity in self.sim.lanes.queues[lane_y]:
+                if entity.x + entity.width <= left:
+                    continue  # Already past the player
+                values += ((entity.x - left) / SCREEN_WIDTH, KIND_CODES[entity.kind], entity.speed / self.base_speed)
+                found += 1
+                if found == self.per_lane:
+                    break
+            values += (1.0, 0.0, 0.0) * (self.per_lane - found)
+        if NUMPY_AVAILABLE:
+            return np.array(values, dtype=np.float32)
+        return array("f", values)
@@ -4,37 +4,74 @@ A side-scrolling skating game built with Pygame
 Compatible with Pygbag for web deployment
 """
 
-import pygame
+import argparse
 import random
+import sys
+import pygame
 import asyncio
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from enum import Enum
 
+from assets import AssetPreloader, ScaleCache, assets
+from atlas import ATLAS_SPRITES
+from render import DirtyRectRenderer, Hud, ParallaxCompositor, PixelObserver, ScreenCache, TextCache
+from simulation import (FPS, MAX_LIVES, POOL_LIMITS, POOL_SIZES, ROCK_MAX_SCALE, ROCK_MIN_SCALE, ROCK_SCALE_STEPS,
+                        SCREEN_HEIGHT, SCREEN_WIDTH, TICK, TICK_RATE, Entity, FixedTimestep, PlayerState, Scheduler,
+                        Simulation, autopilot, lerp, run_headless, scale_pools)
+
 # Constants
-SCREEN_WIDTH = 1200
-SCREEN_HEIGHT = 700
 SCREEN_TITLE = "Pinoy Skater"
-FPS = 60
-
-# Game speeds
-INITIAL_OBSTACLE_INTERVAL = 2.5
-INITIAL_ITEM_INTERVAL = 1.0
-INITIAL_OBJECT_SPEED = 15
-SPEED_INCREASE_INTERVAL = 30.0
 
-# Player constants
-PLAYER_X = 100
-PLAYER_Y = 130
-JUMP_HEIGHT = 180  # Increased for higher jumps
-JUMP_DURATION = 1.0
-
-# Position constants
-BOTTOM_Y = 130
-TOP_Y = 300
-VERY_TOP_Y = 400
-
-# Lives
-MAX_LIVES = 3
+# Parallax layers scroll their speed in pixels every PARALLAX_STEP seconds
+PARALLAX_STEP = 0.1
+
+# Seconds the hit effect stays on screen
+HIT_EFFECT_TIME = 0.5
+
+# Image of every simulated sprite kind; collision sizes come from these
+SPRITE_IMAGES = {
+    "rock": "images/Rock.png",
+    "bird": "images/Bird.png",
+    "candy": "images/Candy.png",
+    "coin": "images/Coin.png",
+    "heart": "images/Heart.png",
+    "skater": "images/Skater.png",
+    "skater_jump": "images/SkaterJump.png",
+    "skater_sitting": "images/SkaterSitting.png",
+}
+
+# Sound played when an entity of each kind is hit or collected
+SPRITE_SOUNDS = {
+    "rock": "sounds/ouch.ogg",
+    "bird": "sounds/ouch.ogg",
+    "candy": "sounds/candy.ogg",
+    "coin": "sounds/coin_pickup.ogg",
+    "heart": "sounds/coin_pickup.ogg",
+}
+
+# Images decoded in the background while the start screen is showing,
+# as (path, alpha, size) in the order they are first needed
+PRELOAD_IMAGES = [
+    ("images/StartScreenImage.png", False, (SCREEN_WIDTH, SCREEN_HEIGHT)),
+    ("images/InstructionsImage.png", False, (SCREEN_WIDTH, SCREEN_HEIGHT)),
+    ("images/GameOverScreenImage.png", False, (SCREEN_WIDTH, SCREEN_HEIGHT)),
+    ("images/NonMovingBG.png", False, None),
+    ("images/clouds_01.png", True, None),
+    ("images/clouds_02.png", True, None),
+    ("images/Mountains_01.png", True, None),
+    ("images/Mountains_02.png", True, None),
+    ("images/Road_01.png", True, None),
+    ("images/Road_02.png", True, None),
+    ("images/Skater.png", True, None),
+    ("images/SkaterJump.png", True, None),
+    ("images/SkaterSitting.png", True, None),
+    ("images/Rock.png", True, None),
+    ("images/Bird.png", True, None),
+    ("images/Candy.png", True, None),
+    ("images/Coin.png", True, None),
+    ("images/Heart.png", True, None),
+    ("images/Hit.png", True, None),
+]
 
 # Colors
 SKY_BLUE = (135, 206, 235)
@@ -52,230 +89,112 @@ class GameState(Enum):
     GAME_OVER = 4
 
 
-class PlayerState(Enum):
-    """Enum for player animation states"""
-    NORMAL = 0
-    JUMPING = 1
-    SITTING = 2
+def load_sprite(image_path: str) -> pygame.Surface:
+    """Load a shared sprite image, or a red placeholder if it is missing"""
+    try:
+        # Shared with every other object using the same file - never draw into it
+        return assets.image(image_path)
+    except pygame.error as e:
+        print(f"Warning: Could not load image {image_path}: {e}")
+        image = pygame.Surface((50, 50))
+        image.fill((255, 0, 0))
+        return image
 
 
 class GameObject:
-    """Base class for game objects that move across the screen"""
+    """Draws one simulated entity that moves across the screen"""
 
-    def __init__(self, image_path: str, y: float, speed: float = 0):
-        try:
-            self.image = pygame.image.load(image_path).convert_alpha()
-        except pygame.error as e:
-            print(f"Warning: Could not load image {image_path}: {e}")
-            self.image = pygame.Surface((50, 50))
-            self.image.fill((255, 0, 0))
-
-        self.speed = speed
-        self.performing = False
-        self.initial_y = y
+    def __init__(self, entity: Entity, image: pygame.Surface, sound_path: Optional[str] = None):
+        self.entity = entity
+        self.image = image
+        self.sound = assets.sound(sound_path) if sound_path else None
 
-        # Position: x is left edge, y is bottom edge (converted from Arcade coordinates)
-        self.x = SCREEN_WIDTH
-        self.rect = self.image.get_rect()
-        self.rect.left = self.x
-        # Convert from Arcade (bottom-origin) to Pygame (top-origin)
-        self.rect.bottom = SCREEN_HEIGHT - y
+    @property
+    def x(self) -> float:
+        return self.entity.x
 
-    def update(self, delta_time: float):
-        """Update object position"""
-        if self.performing:
-            # Move left
-            self.x -= self.speed
-            self.rect.left = self.x
+    @property
+    def performing(self) -> bool:
+        return self.entity.active
 
-            # Reset when off screen
-            if self.x <= -self.rect.width:
-                self.reset()
+    @property
+    def rect(self) -> pygame.Rect:
+        """Screen rect of the entity, from its simulated position and size"""
+        return pygame.Rect(self.entity.box())
 
-    def reset(self):
-        """Reset object to initial position"""
-        self.x = SCREEN_WIDTH
-        self.rect.left = self.x
-        # Convert from Arcade (bottom-origin) to Pygame (top-origin)
-        self.rect.bottom = SCREEN_HEIGHT - self.initial_y
-        self.performing = False
+    def play_sound(self):
+        """Play the hit or collection sound"""
+        if self.sound:
+            self.sound.play()
 
-    def draw(self, screen: pygame.Surface):
-        """Draw the sprite"""
-        screen.blit(self.image, self.rect)
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
+        """Draw the sprite between its last two ticks and return the area it covered"""
+        return screen.blit(self.image, self.entity.render_box(alpha))
 
 
 class Obstacle(GameObject):
     """Obstacle that damages the player"""
 
-    def __init__(self, image_path: str, y: float, sound_path: Optional[str] = None, is_rock: bool = False):
-        super().__init__(image_path, y)
-        self.sound = None
-        if sound_path:
-            try:
-                self.sound = pygame.mixer.Sound(sound_path)
-            except pygame.error as e:
-                print(f"Warning: Could not load sound {sound_path}: {e}")
-
-        # For scaling rocks over time
-        self.is_rock = is_rock
-        self.original_image = self.image.copy()  # Keep original for scaling
-        self.scale_factor = 0.5 if is_rock else 1.0  # Rocks start at 50% size
-
-        # Apply initial scale for rocks
-        if is_rock:
-            new_width = int(self.original_image.get_width() * self.scale_factor)
-            new_height = int(self.original_image.get_height() * self.scale_factor)
-            self.image = pygame.transform.scale(self.original_image, (new_width, new_height))
-            # Update rect with new size
-            self.rect = self.image.get_rect()
-            self.rect.left = self.x
-            self.rect.bottom = SCREEN_HEIGHT - y
-
-    def set_scale(self, scale_factor: float):
-        """Scale the obstacle image"""
-        if self.is_rock:
-            self.scale_factor = scale_factor
-            # Scale the original image
-            new_width = int(self.original_image.get_width() * scale_factor)
-            new_height = int(self.original_image.get_height() * scale_factor)
-            self.image = pygame.transform.scale(self.original_image, (new_width, new_height))
-
-            # Update rect size but maintain position
-            old_bottom = self.rect.bottom
-            old_left = self.rect.left
-            self.rect = self.image.get_rect()
-            self.rect.left = old_left
-            self.rect.bottom = old_bottom
+    def __init__(self, entity: Entity, image: pygame.Surface, sound_path: Optional[str] = None,
+                 scale_cache: Optional[ScaleCache] = None):
+        super().__init__(entity, image, sound_path)
+        self.is_rock = entity.is_rock
+        self.original_image = image  # Shared original, scaling never modifies it
+        # Scaled images are shared with every other rock using the same cache
+        self.scale_cache = scale_cache if scale_cache else ScaleCache(ROCK_MIN_SCALE, ROCK_MAX_SCALE,
+                                                                      ROCK_SCALE_STEPS)
 
-    def play_sound(self):
-        """Play hit sound"""
-        if self.sound:
-            self.sound.play()
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
+        """Draw the rock at its simulated scale step, or the obstacle as is"""
+        if self.is_rock and self.entity.scale_step is not None:
+            self.image = self.scale_cache.get(self.original_image, self.entity.scale_step)
+        return super().draw(screen, alpha)
 
 
 class Item(GameObject):
     """Collectible item that gives points and/or health"""
 
-    def __init__(self, image_path: str, y: float, points: int = 0, health: int = 0, sound_path: Optional[str] = None):
-        super().__init__(image_path, y)
-        self.points = points
-        self.health = health  # Amount of health to restore
-        self.sound = None
-        if sound_path:
-            try:
-                self.sound = pygame.mixer.Sound(sound_path)
-            except pygame.error as e:
-                print(f"Warning: Could not load sound {sound_path}: {e}")
-
-    def play_sound(self):
-        """Play collection sound"""
-        if self.sound:
-            self.sound.play()
+    @property
+    def points(self) -> int:
+        return self.entity.points
 
 
 class Player:
-    """The main player character"""
+    """Draws the simulated player body and forwards inputs to the simulation"""
 
-    def __init__(self):
-        # Load player sprites for different states
-        try:
-            self.images = {
-                PlayerState.NORMAL: pygame.image.load("images/Skater.png").convert_alpha(),
-                PlayerState.JUMPING: pygame.image.load("images/SkaterJump.png").convert_alpha(),
-                PlayerState.SITTING: pygame.image.load("images/SkaterSitting.png").convert_alpha()
-            }
-        except pygame.error as e:
-            print(f"Warning: Could not load player images: {e}")
-            # Create fallback images
-            fallback = pygame.Surface((50, 100))
-            fallback.fill((0, 255, 0))
-            self.images = {
-                PlayerState.NORMAL: fallback,
-                PlayerState.JUMPING: fallback.copy(),
-                PlayerState.SITTING: fallback.copy()
-            }
-
-        self.current_state = PlayerState.NORMAL
-        self.current_image = self.images[PlayerState.NORMAL]
-
-        # Position (y is the bottom of the sprite in Arcade coordinates)
-        self.x = PLAYER_X
-        self.y = PLAYER_Y
-
-        # Create rect for positioning
-        self.rect = self.current_image.get_rect()
-        self.rect.left = self.x
-        # Convert from Arcade (bottom-origin) to Pygame (top-origin)
-        self.rect.bottom = SCREEN_HEIGHT - self.y
-
-        # Jump mechanics
-        self.is_jumping = False
-        self.jump_timer = 0
-        self.is_sitting = False
+    def __init__(self, sim: Simulation, images: dict):
+        self.sim = sim
+        self.body = sim.player
+        self.images = images
 
-    def update(self, delta_time: float):
-        """Update player state and position"""
-        # Handle jumping
-        if self.is_jumping:
-            self.jump_timer += delta_time
-
-            # Simple parabolic jump
-            progress = self.jump_timer / JUMP_DURATION
-            if progress < 1.0:
-                # Parabolic motion
-                height = 4 * JUMP_HEIGHT * progress * (1 - progress)
-                self.y = PLAYER_Y + height
-            else:
-                # Jump complete
-                self.y = PLAYER_Y
-                self.is_jumping = False
-                self.jump_timer = 0
-                self.current_state = PlayerState.NORMAL
-                self.current_image = self.images[PlayerState.NORMAL]
-        else:
-            self.y = PLAYER_Y
+    @property
+    def x(self) -> float:
+        return self.body.x
 
-        # Update rect position
-        self.rect = self.current_image.get_rect()
-        self.rect.left = self.x
-        # Convert from Arcade (bottom-origin) to Pygame (top-origin)
-        self.rect.bottom = SCREEN_HEIGHT - self.y
+    @property
+    def rect(self) -> pygame.Rect:
+        """Screen rect of the player as of the last update"""
+        return pygame.Rect(self.body.box())
 
     def jump(self):
         """Make the player jump"""
-        if not self.is_jumping and not self.is_sitting:
-            self.is_jumping = True
-            self.jump_timer = 0
-            self.current_state = PlayerState.JUMPING
-            self.current_image = self.images[PlayerState.JUMPING]
+        self.sim.input("jump")
 
     def sit(self):
         """Make the player sit"""
-        if not self.is_jumping and not self.is_sitting:
-            self.is_sitting = True
-            self.current_state = PlayerState.SITTING
-            self.current_image = self.images[PlayerState.SITTING]
+        self.sim.input("sit")
 
     def stand_up(self):
         """Make the player stand up from sitting"""
-        if self.is_sitting:
-            self.is_sitting = False
-            self.current_state = PlayerState.NORMAL
-            self.current_image = self.images[PlayerState.NORMAL]
+        self.sim.input("stand")
 
-    def draw(self, screen: pygame.Surface):
-        """Draw the current player sprite"""
-        screen.blit(self.current_image, self.rect)
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
+        """Draw the current player sprite between its last two ticks and return the area it covered"""
+        return screen.blit(self.images[self.body.state], self.body.render_box(alpha))
 
     def get_hitbox(self) -> pygame.Rect:
         """Get player hitbox for collision detection"""
-        # Slightly smaller hitbox for better gameplay
-        margin_x = 25
-        hitbox = self.rect.copy()
-        hitbox.left += margin_x
-        hitbox.width -= 2 * margin_x
-        return hitbox
+        return pygame.Rect(self.body.hitbox())
 
 
 class ParallaxLayer:
@@ -283,54 +202,69 @@ class ParallaxLayer:
 
     def __init__(self, image_path1: str, image_path2: str, speed: float):
         try:
-            self.image1 = pygame.image.load(image_path1).convert_alpha()
-            self.image2 = pygame.image.load(image_path2).convert_alpha()
+            self.image1 = assets.image(image_path1)
+            self.image2 = assets.image(image_path2)
         except pygame.error as e:
             print(f"Warning: Could not load parallax images: {e}")
             self.image1 = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
             self.image1.fill((100, 100, 255))
             self.image2 = self.image1.copy()
 
-        # Position sprites by their left edge
-        self.x1 = 0
-        self.x2 = SCREEN_WIDTH
-
         self.rect1 = self.image1.get_rect()
         self.rect2 = self.image2.get_rect()
-
-        self.rect1.left = self.x1
         self.rect1.bottom = SCREEN_HEIGHT
-        self.rect2.left = self.x2
         self.rect2.bottom = SCREEN_HEIGHT
 
         self.speed = speed
 
+        # Distance scrolled at the current and previous tick, for interpolation
+        self.offset = 0.0
+        self.previous_offset = 0.0
+
+        # Position sprites by their left edge
+        self.x1 = None
+        self.x2 = None
+        self.place(1.0)
+
+    def reset(self):
+        """Rewind both images to their starting positions"""
+        self.offset = 0.0
+        self.previous_offset = 0.0
+        self.place(1.0)
+
     def update(self, delta_time: float):
-        """Update parallax layer position"""
-        # Move based on speed
-        self.x1 -= self.speed
-        self.x2 -= self.speed
-
-        # Reset positions for seamless looping
-        if self.x1 <= -SCREEN_WIDTH:
-            self.x1 = SCREEN_WIDTH
-        if self.x2 <= -SCREEN_WIDTH:
-            self.x2 = SCREEN_WIDTH
-
-        # Update rect positions
+        """Scroll smoothly by speed pixels every PARALLAX_STEP seconds"""
+        self.previous_offset = self.offset
+        self.offset += self.speed * delta_time / PARALLAX_STEP
+
+    def place(self, alpha: float) -> bool:
+        """Position both images between the last two ticks; return whether they moved"""
+        offset = int(lerp(self.previous_offset, self.offset, alpha))
+
+        # The two images take turns, wrapping back to the right edge once fully off screen
+        x1 = SCREEN_WIDTH - (offset + SCREEN_WIDTH) % (2 * SCREEN_WIDTH)
+        x2 = SCREEN_WIDTH - offset % (2 * SCREEN_WIDTH)
+        if (x1, x2) == (self.x1, self.x2):
+            return False
+
+        self.x1 = x1
+        self.x2 = x2
         self.rect1.left = self.x1
         self.rect2.left = self.x2
+        return True
 
     def draw(self, screen: pygame.Surface):
-        """Draw both sprites"""
-        screen.blit(self.image1, self.rect1)
-        screen.blit(self.image2, self.rect2)
+        """Draw whichever of the two sprites is on screen"""
+        if self.rect1.right > 0 and self.rect1.left < SCREEN_WIDTH:
+            screen.blit(self.image1, self.rect1)
+        if self.rect2.right > 0 and self.rect2.left < SCREEN_WIDTH:
+            screen.blit(self.image2, self.rect2)
 
 
 class PinoySkaterGame:
     """Main game application"""
 
-    def __init__(self):
+    def __init__(self, fps: int = FPS, stress: float = 1.0, debug: bool = False):
         pygame.init()
         pygame.mixer.init()
 
@@ -338,8 +272,27 @@ class PinoySkaterGame:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(SCREEN_TITLE)
 
-        # Clock for framerate
+        # Clock for framerate; the simulation tick rate does not depend on it
         self.clock = pygame.time.Clock()
+        self.fps = fps
+
+        # Multiplies the pool sizes and spawn rates, for stress tests (see stress.py)
+        self.stress = stress
+
+        # Print diagnostics such as the asset load report
+        self.debug = debug
+
+        # Play screen renderer: only the scrolled parallax bands and the
+        # sprites are redrawn and presented
+        self.use_dirty_rects = True
+        self.renderer = DirtyRectRenderer(self.screen)
+
+        # Rendered text and the composited START / INSTRUCTIONS / GAME_OVER screens
+        self.text_cache = TextCache()
+        self.screen_cache = ScreenCache((SCREEN_WIDTH, SCREEN_HEIGHT), SKY_BLUE)
+
+        # Pixels of the screen for agents, set up by set_pixel_observation
+        self.observer: Optional[PixelObserver] = None
 
         # Game state
         self.game_state = GameState.START
@@ -351,24 +304,24 @@ class PinoySkaterGame:
 
         # Game objects
         self.player: Optional[Player] = None
-        self.obstacles: List[Obstacle] = []
-        self.items: List[Item] = []
+        # Sprite drawing each simulated entity, by entity
+        self.sprite_images = {}
+        self.entity_sprites = {}
 
         # Background
         self.background = None
         self.background_rect = None
         self.parallax_layers: List[ParallaxLayer] = []
+        self.parallax: Optional[ParallaxCompositor] = None
+
+        # Game rules, score and lives; rebuilt with the real sprite sizes by build_world
+        self.sim = Simulation()
+
+        # Runs the simulation in fixed ticks whatever the frame rate
+        self.timestep = FixedTimestep()
 
-        # Game state variables
-        self.score = 0
-        self.lives = MAX_LIVES
-        self.time_elapsed = 0
-        self.obstacle_timer = 0
-        self.item_timer = 0
-        self.heart_timer = 0
-        self.heart_interval = random.uniform(20.0, 30.0)  # Random 20-30 seconds
-        self.speed_multiplier = 1.0
-        self.parallax_timer = 0
+        # Set once the pooled world has been built by build_world
+        self.world_built = False
 
         # Sounds
         self.button_click_sound = None
@@ -377,13 +330,18 @@ class PinoySkaterGame:
         # Hit effect
         self.hit_sprite = None
         self.hit_sprite_rect = None
-        self.hit_timer = 0
         self.show_hit = False
 
+        # Timed presentation effects, advanced with the simulation ticks
+        self.effects = Scheduler()
+
         # Hearts for lives display
         self.heart_image = None
         self.heart_rects = []
 
+        # Score and lives overlay, created by build_world
+        self.hud: Optional[Hud] = None
+
         # Fonts
         self.large_font = pygame.font.Font(None, 72)
         self.medium_font = pygame.font.Font(None, 48)
@@ -394,73 +352,108 @@ class PinoySkaterGame:
         self.instructions_bg = None
         self.gameover_bg = None
 
+        # Background image decoding, started by setup_start_screen
+        self.preloader: Optional[AssetPreloader] = None
+
         self.setup()
 
     def setup(self):
         """Set up the game"""
         # Load sounds
-        try:
-            self.button_click_sound = pygame.mixer.Sound("sounds/clicked_button.ogg")
-            self.game_over_sound = pygame.mixer.Sound("sounds/gameover.ogg")
-        except pygame.error as e:
-            print(f"Warning: Could not load sound files: {e}")
+        self.button_click_sound = assets.sound("sounds/clicked_button.ogg")
+        self.game_over_sound = assets.sound("sounds/gameover.ogg")
 
         # Load background music
         try:
             pygame.mixer.music.load("sounds/bg.ogg")
             pygame.mixer.music.set_volume(0.5)  # Set to 50% volume
-        except pygame.error as e:
+        except (pygame.error, FileNotFoundError) as e:
             print(f"Warning: Could not load background music: {e}")
 
+        # Use pre-scaled images and the sprite atlas from bake.py when they are up to date
+        assets.use_baked()
+
         # Setup start screen
         self.setup_start_screen()
 
     def setup_start_screen(self):
         """Setup start screen elements"""
-        try:
-            # Load and scale background to match screen size
-            bg_image = pygame.image.load("images/StartScreenImage.png").convert()
-            self.start_bg = pygame.transform.scale(bg_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Decode the full-screen backgrounds and gameplay sprites in the background;
+        # the screens pick them up in update_screen_images as they become ready
+        self.preloader = AssetPreloader(assets, PRELOAD_IMAGES)
+        self.preloader.start()
 
-            self.start_button = pygame.image.load("images/StartButton.png").convert_alpha()
+        try:
+            button = assets.image("images/StartButton.png")
             # Scale button proportionally based on screen size
             scale_factor = min(SCREEN_WIDTH / 1200, SCREEN_HEIGHT / 700)  # Original design was 1200x700
             button_scale = scale_factor * 2
-            self.start_button = pygame.transform.scale(self.start_button,
-                                                      (int(self.start_button.get_width() * button_scale),
-                                                       int(self.start_button.get_height() * button_scale)))
+            self.start_button = assets.image("images/StartButton.png",
+                                             size=(int(button.get_width() * button_scale),
+                                                   int(button.get_height() * button_scale)))
             self.start_button_rect = self.start_button.get_rect()
             # In Pygame, Y increases downward (opposite of Arcade), so + moves down
             self.start_button_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + int(100 * scale_factor))
         except pygame.error as e:
             print(f"Warning: Could not load start screen images: {e}")
 
-        try:
-            # Load and scale instructions background to match screen size
-            inst_image = pygame.image.load("images/InstructionsImage.png").convert()
-            self.instructions_bg = pygame.transform.scale(inst_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except pygame.error:
-            pass
+        self.update_screen_images()
+
+    def update_screen_images(self):
+        """Pick up screen backgrounds the preloader has finished"""
+        size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.start_bg = assets.peek("images/StartScreenImage.png", False, size)
+        self.instructions_bg = assets.peek("images/InstructionsImage.png", False, size)
+        self.gameover_bg = assets.peek("images/GameOverScreenImage.png", False, size)
+
+    def setup_game(self, seed: Optional[int] = None):
+        """Setup game elements, building the world only the first time"""
+        if not self.world_built:
+            # Anything the preloader has not finished yet is needed right now
+            if self.preloader:
+                self.preloader.finish()
+                self.update_screen_images()
+            # Pack the small sprites into one sheet (already done if bake.py was run)
+            assets.load_atlas(ATLAS_SPRITES)
+            self.build_world()
+            if self.debug:
+                # Everything the game loads up front has been loaded by now
+                print(f"Assets:\n{assets.report()}")
+        self.reset_game(seed)
+
+    @property
+    def score(self) -> int:
+        return self.sim.score
+
+    @property
+    def lives(self) -> int:
+        return self.sim.lives
+
+    @lives.setter
+    def lives(self, lives: int):
+        self.sim.lives = lives
+
+    @property
+    def time_elapsed(self) -> float:
+        return self.sim.time_elapsed
+
+    @property
+    def speed_multiplier(self) -> float:
+        return self.sim.speed_multiplier
+
+    def reset_game(self, seed: Optional[int] = None):
+        """Rewind the existing world for a new run without loading anything"""
+        # Reset game state and every pooled object
+        self.sim.reset(seed)
+        self.timestep.reset()
 
-        try:
-            # Load and scale game over background to match screen size
-            go_image = pygame.image.load("images/GameOverScreenImage.png").convert()
-            self.gameover_bg = pygame.transform.scale(go_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except pygame.error:
-            pass
-
-    def setup_game(self):
-        """Setup game elements"""
-        # Reset game state
-        self.score = 0
-        self.lives = MAX_LIVES
-        self.time_elapsed = 0
-        self.obstacle_timer = 0
-        self.item_timer = 0
-        self.heart_timer = 0
-        self.heart_interval = random.uniform(20.0, 30.0)  # Random 20-30 seconds
-        self.speed_multiplier = 1.0
-        self.parallax_timer = 0
+        # Hit effect
+        self.show_hit = False
+        self.effects.clear()
+
+        # Rewind the background
+        for layer in self.parallax_layers:
+            layer.reset()
 
         # Start background music (loop indefinitely)
         try:
@@ -469,12 +462,24 @@ class PinoySkaterGame:
         except pygame.error as e:
             print(f"Warning: Could not play background music: {e}")
 
+    def build_world(self):
+        """Create the player, backgrounds and object pools (runs once)"""
+        # Sprite images; the simulation takes its collision sizes from them
+        sprites = {kind: load_sprite(path) for kind, path in SPRITE_IMAGES.items()}
+        self.sim = Simulation({kind: image.get_size() for kind, image in sprites.items()},
+                              pool_sizes=scale_pools(POOL_SIZES, self.stress),
+                              pool_limits=scale_pools(POOL_LIMITS, self.stress), spawn_rate=self.stress)
+
         # Create player
-        self.player = Player()
+        self.player = Player(self.sim, {
+            PlayerState.NORMAL: sprites["skater"],
+            PlayerState.JUMPING: sprites["skater_jump"],
+            PlayerState.SITTING: sprites["skater_sitting"],
+        })
 
         # Setup background
         try:
-            self.background = pygame.image.load("images/NonMovingBG.png").convert()
+            self.background = assets.image("images/NonMovingBG.png", alpha=False)
             self.background_rect = self.background.get_rect()
             self.background_rect.left = 0
             self.background_rect.bottom = SCREEN_HEIGHT
@@ -490,58 +495,33 @@ class PinoySkaterGame:
             self.background = None
             self.parallax_layers = []
 
-        # Create obstacles pool
-        self.obstacles = []
-        try:
-            # Rocks - start small and grow to full size after 3 minutes
-            for _ in range(5):
-                self.obstacles.append(
-                    Obstacle("images/Rock.png", BOTTOM_Y, "sounds/ouch.ogg", is_rock=True)
-                )
-            # Birds - always full size
-            for _ in range(5):
-                self.obstacles.append(
-                    Obstacle("images/Bird.png", TOP_Y, "sounds/ouch.ogg", is_rock=False)
-                )
-        except Exception as e:
-            print(f"Warning: Could not create obstacles: {e}")
-
-        # Create items pool (no hearts here - they spawn on timer)
-        self.items = []
-        try:
-            # Candy (top) - high points
-            for _ in range(5):
-                self.items.append(
-                    Item("images/Candy.png", VERY_TOP_Y, points=200, sound_path="sounds/candy.ogg")
-                )
-            # Coins (bottom) - medium points
-            for _ in range(10):
-                self.items.append(
-                    Item("images/Coin.png", BOTTOM_Y, points=100, sound_path="sounds/coin_pickup.ogg")
-                )
-        except Exception as e:
-            print(f"Warning: Could not create items: {e}")
-
-        # Create heart item (single item, spawns rarely)
-        self.heart = None
-        try:
-            self.heart = Item("images/Heart.png", TOP_Y, points=50, health=1, sound_path="sounds/coin_pickup.ogg")
-        except Exception as e:
-            print(f"Warning: Could not create heart item: {e}")
+        # Flattens the background with the near-static clouds and scrolls the
+        # faster layers in place
+        self.parallax = ParallaxCompositor((SCREEN_WIDTH, SCREEN_HEIGHT), self.background,
+                                           self.background_rect, self.parallax_layers, SKY_BLUE)
+
+        # Rock sizes between 50% and 100%, scaled once and shared by every rock
+        self.rock_scales = ScaleCache(ROCK_MIN_SCALE, ROCK_MAX_SCALE, steps=ROCK_SCALE_STEPS)
+
+        # Sprites for every pooled entity; pools that grow later get theirs on first draw
+        self.sprite_images = sprites
+        self.entity_sprites = {}
+        for entity in self.sim.entities():
+            self.sprite_for(entity)
 
         # Setup hit effect
         try:
-            self.hit_sprite = pygame.image.load("images/Hit.png").convert_alpha()
+            self.hit_sprite = assets.image("images/Hit.png")
             self.hit_sprite_rect = self.hit_sprite.get_rect()
         except pygame.error:
             print("Warning: Hit effect image not found")
 
         # Setup heart sprites for lives
         try:
-            self.heart_image = pygame.image.load("images/Heart.png").convert_alpha()
-            self.heart_image = pygame.transform.scale(self.heart_image,
-                                                     (int(self.heart_image.get_width() * 0.8),
-                                                      int(self.heart_image.get_height() * 0.8)))
+            heart = assets.image("images/Heart.png")
+            self.heart_image = assets.image("images/Heart.png",
+                                            size=(int(heart.get_width() * 0.8),
+                                                  int(heart.get_height() * 0.8)))
             self.heart_rects = []
             for i in range(MAX_LIVES):
                 rect = self.heart_image.get_rect()
@@ -551,6 +531,10 @@ class PinoySkaterGame:
         except pygame.error:
             print("Warning: Heart image not found")
 
+        self.hud = Hud(self.small_font, WHITE, (10, SCREEN_HEIGHT - 70), self.heart_image, self.heart_rects)
+
+        self.world_built = True
+
     def handle_events(self):
         """Handle pygame events"""
         for event in pygame.event.get():
@@ -623,207 +607,171 @@ class PinoySkaterGame:
 
     def update(self, delta_time: float):
         """Update game logic"""
+        if self.preloader and not self.preloader.done:
+            if self.preloader.poll():
+                self.update_screen_images()
+
         if self.game_state == GameState.PLAYING:
-            self.update_game(delta_time)
-
-    def update_game(self, delta_time: float):
-        """Update game state"""
-        # Update time
-        self.time_elapsed += delta_time
-
-        # Update speed multiplier
-        self.speed_multiplier = 1.0 + (int(self.time_elapsed / SPEED_INCREASE_INTERVAL) * 0.5)
-
-        # Update rock scale - for the first minute, all rocks grow uniformly
-        # After 1 minute, rocks spawn with random sizes (set in spawn_obstacle)
-        if self.time_elapsed < 60.0:
-            # First minute: gradually grow from 50% to 100%
-            rock_scale_progress = min(self.time_elapsed / 60.0, 1.0)  # 60 seconds = 1 minute
-            rock_scale = 0.5 + (rock_scale_progress * 0.5)  # Scale from 0.5 to 1.0
-            for obstacle in self.obstacles:
-                if obstacle.is_rock:
-                    obstacle.set_scale(rock_scale)
+            for _ in range(self.timestep.advance(delta_time)):
+                self.update_game()
+                if self.game_state != GameState.PLAYING:
+                    break
 
+    def update_game(self):
+        """Advance the game by one fixed tick"""
         # Update parallax layers
-        self.parallax_timer += delta_time
-        if self.parallax_timer >= 0.1:
-            for layer in self.parallax_layers:
-                layer.update(0.1)
-            self.parallax_timer = 0
+        for layer in self.parallax_layers:
+            layer.update(TICK)
 
-        # Update player
-        if self.player:
-            self.player.update(delta_time)
-
-        # Spawn obstacles
-        self.obstacle_timer += delta_time
-        if self.obstacle_timer >= INITIAL_OBSTACLE_INTERVAL:
-            self.spawn_obstacle()
-            self.obstacle_timer = 0
-
-        # Spawn items
-        self.item_timer += delta_time
-        if self.item_timer >= INITIAL_ITEM_INTERVAL:
-            self.spawn_item()
-            self.item_timer = 0
-
-        # Spawn heart (rare, every 20-30 seconds)
-        self.heart_timer += delta_time
-        if self.heart_timer >= self.heart_interval:
-            self.spawn_heart()
-            self.heart_timer = 0
-            # Set next random interval
-            self.heart_interval = random.uniform(20.0, 30.0)
-
-        # Update obstacles
-        for obstacle in self.obstacles:
-            obstacle.speed = INITIAL_OBJECT_SPEED * self.speed_multiplier
-            obstacle.update(delta_time)
-
-        # Update items
-        for item in self.items:
-            item.speed = INITIAL_OBJECT_SPEED * self.speed_multiplier
-            item.update(delta_time)
-
-        # Update heart
-        if self.heart and self.heart.performing:
-            self.heart.speed = INITIAL_OBJECT_SPEED * self.speed_multiplier
-            self.heart.update(delta_time)
-
-        # Check collisions
-        self.check_collisions()
-
-        # Update hit effect
-        if self.show_hit:
-            self.hit_timer += delta_time
-            if self.hit_timer >= 0.5:
-                self.show_hit = False
-                self.hit_timer = 0
+        # Move, spawn and collide everything
+        events = self.sim.step()
+        self.on_sim_events(events)
+
+        # Run effects that are due
+        self.effects.advance()
 
         # Check game over
-        if self.lives <= 0:
+        if self.sim.game_over:
             self.game_state = GameState.GAME_OVER
             if self.game_over_sound:
                 self.game_over_sound.play()
 
-    def spawn_obstacle(self):
-        """Spawn a random obstacle"""
-        available = [obs for obs in self.obstacles if not obs.performing]
-        if available:
-            obstacle = random.choice(available)
-            obstacle.performing = True
-            obstacle.x = SCREEN_WIDTH
-            obstacle.rect.left = obstacle.x
-            # Convert from Arcade (bottom-origin) to Pygame (top-origin)
-            obstacle.rect.bottom = SCREEN_HEIGHT - obstacle.initial_y
-
-            # After 1 minute, assign random size to rocks for variety
-            if obstacle.is_rock and self.time_elapsed >= 60.0:
-                random_scale = random.uniform(0.5, 1.0)  # Random size between 50% and 100%
-                obstacle.set_scale(random_scale)
-
-    def spawn_item(self):
-        """Spawn a random item"""
-        available = [item for item in self.items if not item.performing]
-        if available:
-            item = random.choice(available)
-            item.performing = True
-            item.x = SCREEN_WIDTH
-            item.rect.left = item.x
-            # Convert from Arcade (bottom-origin) to Pygame (top-origin)
-            item.rect.bottom = SCREEN_HEIGHT - item.initial_y
-
-    def spawn_heart(self):
-        """Spawn the heart (rare health item)"""
-        if self.heart and not self.heart.performing:
-            self.heart.performing = True
-            self.heart.x = SCREEN_WIDTH
-            self.heart.rect.left = self.heart.x
-            # Convert from Arcade (bottom-origin) to Pygame (top-origin)
-            self.heart.rect.bottom = SCREEN_HEIGHT - self.heart.initial_y
-
-    def check_collisions(self):
-        """Check for collisions between player and objects"""
-        if not self.player:
-            return
-
-        player_hitbox = self.player.get_hitbox()
-
-        # Check obstacle collisions
-        for obstacle in self.obstacles:
-            if obstacle.performing:
-                if player_hitbox.colliderect(obstacle.rect):
-                    obstacle.reset()
-                    obstacle.play_sound()
-                    self.lives -= 1
-
-                    # Show hit effect
-                    self.show_hit = True
-                    self.hit_timer = 0
-                    if self.hit_sprite_rect:
-                        self.hit_sprite_rect.left = self.player.x + obstacle.rect.width
-                        self.hit_sprite_rect.centery = obstacle.rect.centery
-
-        # Check item collisions
-        for item in self.items:
-            if item.performing:
-                if player_hitbox.colliderect(item.rect):
-                    item.reset()
-                    item.play_sound()
-                    self.score += item.points
-
-        # Check heart collision
-        if self.heart and self.heart.performing:
-            if player_hitbox.colliderect(self.heart.rect):
-                self.heart.reset()
-                self.heart.play_sound()
-                self.score += self.heart.points
-                # Restore health
-                self.lives = min(self.lives + self.heart.health, MAX_LIVES)
+    def sprite_for(self, entity: Entity) -> GameObject:
+        """Return the sprite drawing entity, creating it the first time"""
+        sprite = self.entity_sprites.get(entity)
+        if sprite is None:
+            image = self.sprite_images[entity.kind]
+            if entity.is_obstacle:
+                sprite = Obstacle(entity, image, SPRITE_SOUNDS[entity.kind], self.rock_scales)
+            else:
+                sprite = Item(entity, image, SPRITE_SOUNDS[entity.kind])
+            self.entity_sprites[entity] = sprite
+        return sprite
+
+    def on_sim_events(self, events: List[Tuple[str, Entity]]):
+        """Play the sounds and effects of the hits and pickups of one step"""
+        for event, entity in events:
+            self.sprite_for(entity).play_sound()
+
+            if event == "hit":
+                # Show hit effect, for HIT_EFFECT_TIME from the latest hit
+                if self.show_hit:
+                    self.effects.cancel(self.hide_hit_event)
+                self.show_hit = True
+                self.hide_hit_event = self.effects.after(self.sim.ticks(HIT_EFFECT_TIME), self.hide_hit)
+                if self.hit_sprite_rect:
+                    rect = pygame.Rect(entity.box())
+                    self.hit_sprite_rect.left = self.player.x + rect.width
+                    self.hit_sprite_rect.centery = rect.centery
+
+    def hide_hit(self):
+        """End the hit effect"""
+        self.show_hit = False
 
     def draw(self):
         """Render the screen"""
-        self.screen.fill(SKY_BLUE)
+        if self.game_state == GameState.PLAYING:
+            self.place_parallax()
 
-        if self.game_state == GameState.START:
-            self.draw_start_screen()
-        elif self.game_state == GameState.INSTRUCTIONS:
-            self.draw_instructions_screen()
-        elif self.game_state == GameState.PLAYING:
+        if self.game_state == GameState.PLAYING and self.use_dirty_rects:
+            self.renderer.draw(self.parallax, self.draw_game_objects)
+            return
+
+        # Other screens draw over the whole display
+        self.renderer.invalidate()
+        if self.game_state == GameState.PLAYING:
             self.draw_game_screen()
-        elif self.game_state == GameState.GAME_OVER:
-            self.draw_game_over_screen()
+        else:
+            self.screen.blit(self.get_static_screen(), (0, 0))
 
         pygame.display.flip()
 
-    def draw_start_screen(self):
+    def set_pixel_observation(self, size: Optional[Tuple[int, int]] = None, grayscale: bool = False,
+                              smooth: bool = True):
+        """Choose what observe_pixels returns: the screen scaled to size and/or in grayscale"""
+        self.observer = PixelObserver(self.screen, size, grayscale, smooth)
+
+    def observe_pixels(self, hud: bool = False, parallax: bool = False):
+        """Draw the play screen for an agent, without presenting it, and return its pixels
+
+        The HUD and the parallax layers are left out unless asked for; the
+        sprites are then drawn over the sky and static background alone.
+        The array is the observer's own buffer, overwritten in place by the
+        next call (see render.PixelObserver); copy it to keep a frame.
+        """
+        if self.observer is None:
+            self.set_pixel_observation()
+        # The screen no longer holds what the dirty rect renderer left on it
+        self.renderer.invalidate()
+
+        self.place_parallax()
+        if parallax:
+            self.draw_game_background(self.screen)
+        else:
+            background = self.screen_cache.get("observation", (self.background,), self.draw_static_background)
+            self.screen.blit(background, (0, 0))
+        self.draw_game_objects(self.screen, hud)
+        return self.observer.observe()
+
+    def place_parallax(self):
+        """Move the parallax layers to where they are between the last two ticks"""
+        alpha = self.timestep.alpha
+        for layer in self.parallax_layers:
+            layer.place(alpha)
+
+    def get_static_screen(self) -> pygame.Surface:
+        """Return the composite of the current non-playing screen
+
+        Each screen is drawn once and reused until something it shows changes.
+        """
+        if self.game_state == GameState.START:
+            loading = self.preloader.completed if self.preloader and not self.preloader.done else None
+            key = (self.start_bg, self.start_button, loading)
+            return self.screen_cache.get(GameState.START, key, self.draw_start_screen)
+        elif self.game_state == GameState.INSTRUCTIONS:
+            key = (self.instructions_bg,)
+            return self.screen_cache.get(GameState.INSTRUCTIONS, key, self.draw_instructions_screen)
+        else:
+            key = (self.gameover_bg, self.score)
+            return self.screen_cache.get(GameState.GAME_OVER, key, self.draw_game_over_screen)
+
+    def draw_start_screen(self, surface: pygame.Surface):
         """Draw the start screen"""
         if self.start_bg:
-            self.screen.blit(self.start_bg, (0, 0))
+            surface.blit(self.start_bg, (0, 0))
 
         if self.start_button and self.start_button_rect:
-            self.screen.blit(self.start_button, self.start_button_rect)
+            surface.blit(self.start_button, self.start_button_rect)
         else:
             # Fallback text
-            title = self.large_font.render("PINOY SKATER", True, WHITE)
+            title = self.text_cache.render(self.large_font, "PINOY SKATER", True, WHITE)
             title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
-            self.screen.blit(title, title_rect)
+            surface.blit(title, title_rect)
 
-            start_text = self.medium_font.render("Click to Start", True, WHITE)
+            start_text = self.text_cache.render(self.medium_font, "Click to Start", True, WHITE)
             start_rect = start_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            self.screen.blit(start_text, start_rect)
-
-    def draw_instructions_screen(self):
+            surface.blit(start_text, start_rect)
+
+        # Loading bar while the preloader is still decoding
+        if self.preloader and not self.preloader.done:
+            bar_rect = pygame.Rect(0, 0, 400, 12)
+            bar_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40)
+            fill_rect = bar_rect.copy()
+            fill_rect.width = int(bar_rect.width * self.preloader.progress)
+            pygame.draw.rect(surface, WHITE, fill_rect)
+            pygame.draw.rect(surface, WHITE, bar_rect, 2)
+
+    def draw_instructions_screen(self, surface: pygame.Surface):
         """Draw the instructions screen"""
         if self.instructions_bg:
-            self.screen.blit(self.instructions_bg, (0, 0))
+            surface.blit(self.instructions_bg, (0, 0))
         else:
-            self.screen.fill(DARK_BLUE)
+            surface.fill(DARK_BLUE)
 
         # Draw title
-        title = self.medium_font.render("HOW TO PLAY", True, WHITE)
+        title = self.text_cache.render(self.medium_font, "HOW TO PLAY", True, WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        self.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
 
         # Draw instructions
         instructions = [
@@ -838,84 +786,91 @@ class PinoySkaterGame:
 
         y_pos = SCREEN_HEIGHT // 2 + 100
         for line in instructions:
-            text = self.small_font.render(line, True, WHITE)
+            text = self.text_cache.render(self.small_font, line, True, WHITE)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_pos))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
             y_pos -= 40
 
     def draw_game_screen(self):
         """Draw the game screen"""
-        # Draw background
+        self.draw_game_background(self.screen)
+        self.draw_game_objects(self.screen)
+
+    def draw_game_background(self, surface: pygame.Surface):
+        """Draw the sky, static background and parallax layers"""
+        self.parallax.draw(surface)
+
+    def draw_static_background(self, surface: pygame.Surface):
+        """Draw the static background without the parallax layers"""
         if self.background:
-            self.screen.blit(self.background, self.background_rect)
+            surface.blit(self.background, self.background_rect)
 
-        # Draw parallax layers
-        for layer in self.parallax_layers:
-            layer.draw(self.screen)
+    def draw_game_objects(self, surface: pygame.Surface, hud: bool = True) -> List[pygame.Rect]:
+        """Draw the moving sprites and (unless hud is False) the HUD, returning every rect drawn"""
+        rects = []
+        # Sprites are drawn between the last two ticks, however far the frame is from either
+        alpha = self.timestep.alpha
 
         # Draw obstacles
-        for obstacle in self.obstacles:
-            if obstacle.performing:
-                obstacle.draw(self.screen)
+        for entity in self.sim.obstacles:
+            if entity.active:
+                rects.append(self.sprite_for(entity).draw(surface, alpha))
 
         # Draw items
-        for item in self.items:
-            if item.performing:
-                item.draw(self.screen)
+        for entity in self.sim.items:
+            if entity.active:
+                rects.append(self.sprite_for(entity).draw(surface, alpha))
 
         # Draw heart (if spawned)
-        if self.heart and self.heart.performing:
-            self.heart.draw(self.screen)
+        heart = self.sim.heart
+        if heart and heart.active:
+            rects.append(self.sprite_for(heart).draw(surface, alpha))
 
         # Draw player
         if self.player:
-            self.player.draw(self.screen)
+            rects.append(self.player.draw(surface, alpha))
 
         # Draw hit effect
         if self.show_hit and self.hit_sprite:
-            self.screen.blit(self.hit_sprite, self.hit_sprite_rect)
-
-        # Draw lives (hearts)
-        if self.heart_image:
-            for i, rect in enumerate(self.heart_rects):
-                if i < self.lives:
-                    self.screen.blit(self.heart_image, rect)
+            rects.append(surface.blit(self.hit_sprite, self.hit_sprite_rect))
 
-        # Draw score
-        score_text = self.small_font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, SCREEN_HEIGHT - 70))
+        # Draw lives (hearts) and score
+        if hud:
+            self.hud.update(self.score, self.lives)
+            rects.extend(self.hud.draw(surface))
+        return rects
 
-    def draw_game_over_screen(self):
+    def draw_game_over_screen(self, surface: pygame.Surface):
         """Draw the game over screen"""
         if self.gameover_bg:
-            self.screen.blit(self.gameover_bg, (0, 0))
+            surface.blit(self.gameover_bg, (0, 0))
         else:
-            self.screen.fill(DARK_RED)
+            surface.fill(DARK_RED)
 
         # Draw semi-transparent overlay
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.set_alpha(180)
         overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        surface.blit(overlay, (0, 0))
 
         # Draw game over text
-        title = self.large_font.render("GAME OVER", True, WHITE)
+        title = self.text_cache.render(self.large_font, "GAME OVER", True, WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
-        self.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
 
-        score_text = self.medium_font.render(f"Final Score: {self.score}", True, WHITE)
+        score_text = self.text_cache.render(self.medium_font, f"Final Score: {self.score}", True, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
 
-        restart_text = self.small_font.render("Click to Restart", True, WHITE)
+        restart_text = self.text_cache.render(self.small_font, "Click to Restart", True, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
-        self.screen.blit(restart_text, restart_rect)
+        surface.blit(restart_text, restart_rect)
 
     async def run(self):
         """Main game loop (async for pygbag compatibility)"""
         while self.running:
             # Calculate delta time
-            delta_time = self.clock.tick(FPS) / 1000.0
+            delta_time = self.clock.tick(self.fps) / 1000.0
 
             # Handle events
             self.handle_events()
@@ -932,11 +887,81 @@ class PinoySkaterGame:
         pygame.quit()
 
 
-async def main():
+async def main(fps: int = FPS, debug: bool = False):
     """Main function to run the game"""
-    game = PinoySkaterGame()
+    game = PinoySkaterGame(fps, debug=debug)
     await game.run()
 
 
+def main_headless(frames: int, seed: Optional[int], autoplay: bool, tick_rate: int, vectorized: bool = False,
+                  fast: bool = False, plan: bool = False):
+    """Run the simulation without a display and print how it went"""
+    policy = autopilot if autoplay else None
+    if plan:
+        # Imported here like the numpy simulation, which the game never needs
+        from planner import BeamPlanner
+        policy = BeamPlanner()
+    if fast and policy:
+        print("Warning: --fast cannot skip ticks while the bot plays, stepping every tick")
+        fast = False
+    simulation = Simulation
+    if vectorized:
+        # Imported here so the game never pays for loading numpy
+        from entity_store import NUMPY_AVAILABLE, VectorSimulation
+        if not NUMPY_AVAILABLE:
+            print("Warning: numpy is not installed, using the plain simulation")
+        else:
+            simulation = VectorSimulation
+
+    result = run_headless(frames, seed, policy=policy, tick_rate=tick_rate, simulation=simulation, fast=fast)
+    print(f"Seed: {result['seed']}")
+    print(f"Final score: {result['score']}")
+    print(f"Lives left: {result['lives']}")
+    print(f"Frames simulated: {result['frames']} ({result['game_time']:.1f} s of game time)")
+    print(f"Simulated frames per second: {result['fps']:.0f}")
+
+
+def main_check_fast(frames: int, seed: Optional[int], tick_rate: int, vectorized: bool = False) -> bool:
+    """Check that fast-forwarded games end exactly like games stepped tick by tick"""
+    # Only this check needs the checker (and through it entity_store), so the game never loads them
+    from check_fast import check
+    from entity_store import NUMPY_AVAILABLE, VectorSimulation
+    simulation = Simulation
+    if vectorized:
+        if not NUMPY_AVAILABLE:
+            print("Warning: numpy is not installed, using the plain simulation")
+        else:
+            simulation = VectorSimulation
+    # Pick the seed here, as Simulation.reset would, so it is printed and a failure can be replayed
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    return check([seed], [tick_rate], frames, [simulation])
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--headless", action="store_true", help="simulate without a window or sound")
+    parser.add_argument("--frames", type=int, default=FPS * 60, help="frames to simulate when headless")
+    parser.add_argument("--seed", type=int, default=None, help="game seed (a random one is picked if omitted)")
+    parser.add_argument("--autoplay", action="store_true", help="let a simple bot play when headless")
+    parser.add_argument("--plan", action="store_true",
+                        help="let the lookahead planner play when headless (strong but slower, see planner.py)")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE,
+                        help="simulation ticks per second when headless (lower is cheaper)")
+    parser.add_argument("--numpy", action="store_true",
+                        help="keep entities in NumPy arrays when headless (faster with huge pools)")
+    parser.add_argument("--fast", action="store_true",
+                        help="skip ticks in which nothing but movement happens when headless (without --autoplay)")
+    parser.add_argument("--check-fast", action="store_true",
+                        help="check that fast-forwarding gives the same game as stepping every tick, then exit "
+                             "(check_fast.py checks many seeds and tick rates)")
+    parser.add_argument("--fps", type=int, default=FPS, help="display frame rate (e.g. 30 on slow machines)")
+    parser.add_argument("--debug", action="store_true", help="print asset load counts and timings once loaded")
+    args = parser.parse_args()
+
+    if args.check_fast:
+        sys.exit(0 if main_check_fast(args.frames, args.seed, args.tick_rate, args.numpy) else 1)
+    elif args.headless:
+        main_headless(args.frames, args.seed, args.autoplay, args.tick_rate, args.numpy, args.fast, args.plan)
+    else:
+        asyncio.run(main(args.fps, args.debug))
@@ -5,8 +5,9 @@ Compatible with Python 3.13.5+
 """
 
 import arcade
+import json
 import random
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 # Constants
@@ -34,6 +35,33 @@ VERY_TOP_Y = 400
 # Lives
 MAX_LIVES = 3
 
+# Sprite atlas written by bake.py
+ATLAS_IMAGE = "cache/atlas.png"
+ATLAS_INDEX = "cache/atlas.json"
+
+
+_atlas_textures: Optional[Dict[str, arcade.Texture]] = None
+
+
+def sprite_source(image_path: str):
+    """Return the atlas texture for image_path, or the path itself if it is not baked
+
+    All small sprites come out of one sheet, so the game decodes and uploads
+    a single image instead of one per file.
+    """
+    global _atlas_textures
+    if _atlas_textures is None:
+        _atlas_textures = {}
+        try:
+            with open(ATLAS_INDEX) as f:
+                regions = json.load(f)["regions"]
+            sheet = arcade.load_spritesheet(ATLAS_IMAGE)
+            for name, (x, y, width, height) in regions.items():
+                _atlas_textures[name] = sheet.get_texture(arcade.LBWH(x, y, width, height))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Note: Sprite atlas not used ({e}), loading individual images")
+    return _atlas_textures.get(image_path, image_path)
+
 
 class GameState(Enum):
     """Enum for different game states"""
@@ -54,7 +82,7 @@ class GameObject:
     """Base class for game objects that move across the screen"""
 
     def __init__(self, image_path: str, y: float, speed: float = 0):
-        self.sprite = arcade.Sprite(image_path)
+        self.sprite = arcade.Sprite(sprite_source(image_path))
         self.speed = speed
         self.performing = False
         self.initial_y = y
@@ -129,9 +157,9 @@ class Player:
     def __init__(self):
         # Load player sprites for different states
         self.sprites = {
-            PlayerState.NORMAL: arcade.Sprite("images/Skater.png"),
-            PlayerState.JUMPING: arcade.Sprite("images/SkaterJump.png"),
-            PlayerState.SITTING: arcade.Sprite("images/SkaterSitting.png")
+            PlayerState.NORMAL: arcade.Sprite(sprite_source("images/Skater.png")),
+            PlayerState.JUMPING: arcade.Sprite(sprite_source("images/SkaterJump.png")),
+            PlayerState.SITTING: arcade.Sprite(sprite_source("images/SkaterSitting.png"))
         }
 
         self.current_state = PlayerState.NORMAL
@@ -400,7 +428,7 @@ class PinoySkaterGame(arcade.Window):
 
         # Setup hit effect
         try:
-            self.hit_sprite = arcade.Sprite("images/Hit.png")
+            self.hit_sprite = arcade.Sprite(sprite_source("images/Hit.png"))
         except FileNotFoundError:
             print("Warning: Hit effect image not found")
 
@@ -408,7 +436,7 @@ class PinoySkaterGame(arcade.Window):
         self.heart_sprites = []
         try:
             for i in range(MAX_LIVES):
-                heart = arcade.Sprite("images/Heart.png",
+                heart = arcade.Sprite(sprite_source("images/Heart.png"),
                                      center_x=30 + i * 55,
                                      center_y=SCREEN_HEIGHT - 30,
                                      scale=0.8)
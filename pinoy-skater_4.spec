@@ -1,7 +1,13 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
 block_cipher = None
 
+# Ship the baked sprite atlas when bake.py has been run
+atlas_datas = [
+    (path, 'cache') for path in ('cache/atlas.png', 'cache/atlas.json') if os.path.exists(path)
+]
+
 a = Analysis(
     ['pinoy-skater_4.py'],
     pathex=[],
@@ -9,7 +15,7 @@ a = Analysis(
     datas=[
         ('images', 'images'),
         ('sounds', 'sounds'),
-    ],
+    ] + atlas_datas,
     hiddenimports=[
         'arcade',
         'arcade.gl',
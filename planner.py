@@ -0,0 +1,121 @@
+"""
+Pinoy Skater - Planner
+A lookahead autopilot: beam search over the player's inputs, played out on
+the game itself through Simulation.snapshot / restore. It sees the real
+spawns of the seed, so it also finds close to the best score a seed allows.
+"""
+
+import argparse
+import heapq
+import time
+from typing import List, Optional, Tuple
+
+from env import LIFE_VALUE
+from simulation import MAX_LIVES, TICK_RATE, Simulation, run_headless
+
+
+def allowed_inputs(sim: Simulation) -> List[Optional[str]]:
+    """The inputs that would change anything now; None stands for doing nothing"""
+    player = sim.player
+    if player.is_jumping:
+        return [None]
+    if player.is_sitting:
+        return [None, "stand"]
+    return [None, "jump", "sit"]
+
+
+class BeamPlanner:
+    """Policy for run_headless that picks jump / sit / stand by looking ahead
+
+    Every decide_ticks ticks the planner expands each of the beam_width
+    best plans found so far by every allowed input (held for decide_ticks
+    ticks), for horizon ticks ahead, and plays the first input of the best
+    plan. Plans are ranked by score plus life_value per life left; a lost
+    game ranks below everything. Among equal plans the one that acts least
+    wins, so the skater stays put when nothing is coming.
+    """
+
+    def __init__(self, horizon: int = 90, beam_width: int = 4, decide_ticks: int = 6,
+                 life_value: float = LIFE_VALUE):
+        self.horizon = horizon
+        self.beam_width = beam_width
+        self.decide_ticks = decide_ticks
+        self.life_value = life_value
+
+        # Statistics
+        self.plans = 0
+        self.simulated_ticks = 0
+
+    def __call__(self, sim: Simulation):
+        if sim.frames % self.decide_ticks == 0:
+            action = self.plan(sim)
+            if action:
+                sim.input(action)
+
+    def value(self, sim: Simulation, actions: int) -> Tuple[float, int]:
+        """Rank of the state a plan reached, higher is better"""
+        if sim.game_over:
+            return float("-inf"), -actions
+        return sim.score + sim.lives * self.life_value, -actions
+
+    def plan(self, sim: Simulation) -> Optional[str]:
+        """First input of the best plan found from the current state (None to do nothing)
+
+        sim is left exactly as it was.
+        """
+        root = sim.snapshot()
+        # (rank, first input, snapshot, inputs made) of every plan in the beam
+        beam = [((0.0, 0), None, root, 0)]
+        for _ in range(max(1, self.horizon // self.decide_ticks)):
+            candidates = []
+            for rank, first, state, actions in beam:
+                if rank[0] == float("-inf"):
+                    candidates.append((rank, first, state, actions))  # Nothing left to try after game over
+                    continue
+                sim.restore(state)
+                for action in allowed_inputs(sim):
+                    sim.restore(state)
+                    self.expand(sim, action)
+                    taken = actions + (action is not None)
+                    candidates.append((self.value(sim, taken), first if state is not root else action,
+                                       sim.snapshot(), taken))
+            # Stable, so plans found first (those doing nothing) win ties
+            beam = heapq.nlargest(self.beam_width, candidates, key=lambda candidate: candidate[0])
+        sim.restore(root)
+        self.plans += 1
+        return beam[0][1]
+
+    def expand(self, sim: Simulation, action: Optional[str]):
+        """Make action, then run decide_ticks ticks (fewer if the game ends)"""
+        if action:
+            sim.input(action)
+        for _ in range(self.decide_ticks):
+            sim.step()
+            self.simulated_ticks += 1
+            if sim.game_over:
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinoy Skater lookahead planner")
+    parser.add_argument("--seed", type=int, default=None, help="game seed (a random one is picked if omitted)")
+    parser.add_argument("--frames", type=int, default=TICK_RATE * 300, help="ticks to play at most")
+    parser.add_argument("--horizon", type=int, default=90, help="ticks to look ahead")
+    parser.add_argument("--beam-width", type=int, default=4, help="plans kept at every depth")
+    parser.add_argument("--decide-ticks", type=int, default=6, help="ticks between decisions")
+    args = parser.parse_args()
+
+    planner = BeamPlanner(args.horizon, args.beam_width, args.decide_ticks)
+    start = time.perf_counter()
+    result = run_headless(args.frames, args.seed, policy=planner)
+    elapsed = time.perf_counter() - start
+    print(f"Seed: {result['seed']}")
+    print(f"Final score: {result['score']}")
+    print(f"Lives left: {result['lives']} of {MAX_LIVES}")
+    print(f"Frames played: {result['frames']} ({result['game_time']:.1f} s of game time)")
+    print(f"Planning: {planner.plans} plans, {planner.simulated_ticks} ticks simulated, "
+          f"{elapsed / max(planner.plans, 1) * 1000:.1f} ms per plan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+Pinoy Skater - Rendering
+Renderers and caches that keep the per-frame drawing work small
+"""
+
+import sys
+import pygame
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional, only for pixel observations
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+class DirtyRectRenderer:
+    """Draws the play screen by repairing only the regions that changed
+
+    The background is a ParallaxCompositor, which can repaint any area of
+    itself and reports the bands its layers scrolled. Each frame repaints
+    those bands and last frame's sprite rects, draws the sprites and HUD
+    again and presents only the touched rectangles with
+    pygame.display.update. The whole screen is only repainted and flipped
+    on the first frame after invalidate() or when all of it changed.
+    """
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self.background_valid = False
+
+        # Rects drawn last frame, which must be restored before drawing again
+        self.previous_rects: List[pygame.Rect] = []
+
+        # Statistics
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        """Force a full redraw on the next frame (e.g. after another screen was shown)"""
+        self.background_valid = False
+
+    def draw(self, background: "ParallaxCompositor", draw_objects: Callable[[pygame.Surface], List[pygame.Rect]]):
+        """Draw and present one frame
+
+        draw_objects paints everything that moves over the background and
+        returns the rects it touched.
+        """
+        screen_rect = self.screen.get_rect()
+        changed = background.draw_changes(self.screen) if self.background_valid else None
+        if changed is None or any(rect.contains(screen_rect) for rect in changed):
+            if changed is None:
+                background.draw(self.screen)
+                self.background_valid = True
+            self.previous_rects = draw_objects(self.screen)
+            pygame.display.flip()
+            self.full_frames += 1
+            return
+
+        # Erase last frame's sprites outside the repainted bands, then draw this frame's
+        for rect in self.previous_rects:
+            if not any(band.contains(rect) for band in changed):
+                background.draw_area(self.screen, rect)
+        rects = draw_objects(self.screen)
+
+        pygame.display.update(changed + self.previous_rects + rects)
+        self.previous_rects = rects
+        self.partial_frames += 1
+
+
+class ParallaxCompositor:
+    """Composites the static background and the parallax layers with little overdraw
+
+    The background and any layer no faster than flatten_speed are flattened
+    into one opaque base surface, rebuilt only when such a layer has moved.
+    Every faster layer keeps a buffer covering just the rows it has pixels in.
+    Each scroll step moves that buffer in place with Surface.scroll and only
+    redraws the strip it exposed. Layer images lying entirely outside the
+    viewport are never blitted.
+
+    Layers are ParallaxLayer-like objects with image1, image2, rect1, rect2,
+    x1, x2 and speed, where the two images tile seamlessly.
+    """
+
+    def __init__(self, size: Tuple[int, int], background: pygame.Surface, background_rect: pygame.Rect,
+                 layers: list, fill_color: Tuple[int, int, int], flatten_speed: float = 1):
+        self.width, self.height = size
+        self.background = background
+        self.background_rect = background_rect
+        self.fill_color = fill_color
+
+        self.flat_layers = [layer for layer in layers if layer.speed <= flatten_speed]
+        self.scroll_layers = [layer for layer in layers if layer.speed > flatten_speed]
+
+        self.base = pygame.Surface(size).convert()
+        self.base_positions = None
+
+        # Rows the flattened layers have pixels in, all that changes when the base is rebuilt
+        flat_bands = [self._layer_band(layer) for layer in self.flat_layers]
+        self.flat_band = flat_bands[0].unionall(flat_bands[1:]) if flat_bands else pygame.Rect(0, 0, *size)
+
+        # Per scrolling layer: screen band it covers, its buffer and the x1 it shows
+        self.bands = []
+        self.buffers = []
+        self.buffer_positions = []
+        for layer in self.scroll_layers:
+            band = self._layer_band(layer)
+            self.bands.append(band)
+            self.buffers.append(pygame.Surface(band.size, pygame.SRCALPHA).convert_alpha())
+            self.buffer_positions.append(None)
+
+        # Statistics
+        self.base_rebuilds = 0
+        self.strip_pixels = 0
+
+    def update(self) -> List[pygame.Rect]:
+        """Bring the base and the layer buffers up to the layer positions
+
+        Returns the screen areas that look different since the last update:
+        the rows of the flattened layers if one moved (the whole screen the
+        first time) and the band of every layer that scrolled, with
+        overlapping bands merged.
+        """
+        changed = []
+        positions = [(layer.x1, layer.x2) for layer in self.flat_layers]
+        if positions != self.base_positions:
+            first = self.base_positions is None
+            changed.append(pygame.Rect(0, 0, self.width, self.height) if first else self.flat_band)
+            self._build_base()
+            self.base_positions = positions
+
+        for index, layer in enumerate(self.scroll_layers):
+            if self._scroll_buffer(index, layer):
+                changed.append(self.bands[index])
+
+        # Bands span the full width, so overlapping ones merge without repainting anything extra
+        merged = []
+        for rect in sorted(changed, key=lambda rect: rect.top):
+            if merged and merged[-1].bottom >= rect.top:
+                merged[-1] = merged[-1].union(rect)
+            else:
+                merged.append(rect.copy())
+        return merged
+
+    def draw(self, surface: pygame.Surface):
+        """Paint the background and all layers at their current positions"""
+        self.update()
+        surface.blit(self.base, (0, 0))
+        for buffer, band in zip(self.buffers, self.bands):
+            surface.blit(buffer, band)
+
+    def draw_changes(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Repaint only what moved, on a surface showing the last draw or draw_changes
+
+        Returns the rects repainted.
+        """
+        changed = self.update()
+        for rect in changed:
+            self.draw_area(surface, rect)
+        return changed
+
+    def draw_area(self, surface: pygame.Surface, rect: pygame.Rect):
+        """Repaint one area of the background and layers as of the last update"""
+        rect = rect.clip(self.base.get_rect())
+        surface.blit(self.base, rect, rect)
+        for buffer, band in zip(self.buffers, self.bands):
+            overlap = rect.clip(band)
+            if overlap:
+                surface.blit(buffer, overlap, overlap.move(-band.left, -band.top))
+
+    def _layer_band(self, layer) -> pygame.Rect:
+        """Full-width band of screen rows that a layer has pixels in"""
+        bounds = layer.image1.get_bounding_rect().union(layer.image2.get_bounding_rect())
+        return pygame.Rect(0, layer.rect1.top + bounds.top, self.width, bounds.height)
+
+    def _build_base(self):
+        """Flatten the background and the slow layers"""
+        if self.background:
+            if not self.background_rect.contains(self.base.get_rect()):
+                self.base.fill(self.fill_color)
+            self.base.blit(self.background, self.background_rect)
+        else:
+            self.base.fill(self.fill_color)
+        for layer in self.flat_layers:
+            layer.draw(self.base)
+        self.base_rebuilds += 1
+
+    def _scroll_buffer(self, index: int, layer) -> bool:
+        """Bring one layer buffer up to the layer's position; return whether it moved"""
+        buffer = self.buffers[index]
+        previous = self.buffer_positions[index]
+        self.buffer_positions[index] = layer.x1
+        if previous == layer.x1:
+            return False
+
+        # Distance moved left since the buffer was drawn, across the wrap-around
+        moved = None if previous is None else (previous - layer.x1) % (2 * self.width)
+        if moved is None or moved >= self.width:
+            strip = buffer.get_rect()
+        else:
+            buffer.scroll(-moved, 0)
+            strip = pygame.Rect(self.width - moved, 0, moved, buffer.get_height())
+        self._fill_strip(buffer, strip, layer, self.bands[index])
+        return True
+
+    def _fill_strip(self, buffer: pygame.Surface, strip: pygame.Rect, layer, band: pygame.Rect):
+        """Redraw one vertical strip of a layer buffer from the layer images"""
+        buffer.fill((0, 0, 0, 0), strip)
+        buffer.set_clip(strip)
+        for image, rect in ((layer.image1, layer.rect1), (layer.image2, layer.rect2)):
+            target = rect.move(0, -band.top)
+            if target.colliderect(strip):
+                # The buffer is clear here, so MAX copies the layer pixels exactly
+                buffer.blit(image, target, special_flags=pygame.BLEND_RGBA_MAX)
+        buffer.set_clip(None)
+        self.strip_pixels += strip.width * strip.height
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (string, font, color, antialias)
+
+    Rendering text with a Font is slow, so each distinct string is rendered
+    once and reused until it falls out of the LRU.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool,
+               color: Tuple[int, int, int]) -> pygame.Surface:
+        """Same as font.render, but cached (the result is shared and read-only)"""
+        key = (text, font, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+class ScreenCache:
+    """Full-screen composites of static screens, rebuilt only when their inputs change"""
+
+    def __init__(self, size: Tuple[int, int], fill_color: Tuple[int, int, int]):
+        self.size = size
+        self.fill_color = fill_color
+        # Screen name -> (inputs key, composited surface)
+        self.screens: Dict[Hashable, Tuple[tuple, pygame.Surface]] = {}
+        self.builds = 0
+
+    def get(self, name: Hashable, key: tuple, draw: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        """Return the composite for name, redrawing it with draw if key changed"""
+        entry = self.screens.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        # Reuse the old surface when there is one
+        surface = entry[1] if entry is not None else pygame.Surface(self.size).convert()
+        surface.fill(self.fill_color)
+        draw(surface)
+        self.screens[name] = (key, surface)
+        self.builds += 1
+        return surface
+
+    def invalidate(self, name: Hashable = None):
+        """Drop one composite, or all of them"""
+        if name is None:
+            self.screens.clear()
+        else:
+            self.screens.pop(name, None)
+
+
+class Hud:
+    """Retained-mode score counter and lives display
+
+    The "Score:" label and the digits 0-9 are rendered once. The score and
+    lives strips are cached surfaces that are only rebuilt when the score or
+    the number of lives changes; every other frame is two plain blits.
+    """
+
+    def __init__(self, font: pygame.font.Font, color: Tuple[int, int, int], score_pos: Tuple[int, int],
+                 heart_image: pygame.Surface = None, heart_rects: List[pygame.Rect] = (),
+                 label: str = "Score: "):
+        # Glyph atlas for the counter
+        self.label = font.render(label, True, color)
+        self.digits = [font.render(str(digit), True, color) for digit in range(10)]
+        self.score_pos = score_pos
+
+        self.heart_image = heart_image
+        self.heart_rects = list(heart_rects)
+
+        self.score: int = None
+        self.lives: int = None
+        self.score_surface: pygame.Surface = None
+        self.lives_surface: pygame.Surface = None
+        self.lives_pos = (0, 0)
+        self.rebuilds = 0
+
+    def update(self, score: int, lives: int):
+        """Rebuild whichever strip shows a value that changed"""
+        if score != self.score:
+            self.score = score
+            self.score_surface = self._build_score(score)
+            self.rebuilds += 1
+        if lives != self.lives:
+            self.lives = lives
+            self.lives_surface = self._build_lives(lives)
+            self.rebuilds += 1
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Blit the cached strips and return the rects they cover"""
+        rects = [surface.blit(self.score_surface, self.score_pos)]
+        if self.lives_surface:
+            rects.append(surface.blit(self.lives_surface, self.lives_pos))
+        return rects
+
+    def _build_score(self, score: int) -> pygame.Surface:
+        """Lay out the label and the digit glyphs of score side by side"""
+        glyphs = [self.label] + [self.digits[int(digit)] for digit in str(max(score, 0))]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = max(glyph.get_height() for glyph in glyphs)
+        strip = pygame.Surface((width, height), pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            # Glyphs never overlap, so MAX copies their pixels onto the clear strip exactly
+            strip.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += glyph.get_width()
+        return strip
+
+    def _build_lives(self, lives: int) -> pygame.Surface:
+        """Lay out one heart per remaining life"""
+        if not self.heart_image or not self.heart_rects:
+            return None
+        bounds = self.heart_rects[0].unionall(self.heart_rects)
+        self.lives_pos = bounds.topleft
+        strip = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for rect in self.heart_rects[:max(lives, 0)]:
+            strip.blit(self.heart_image, rect.move(-bounds.left, -bounds.top),
+                       special_flags=pygame.BLEND_RGBA_MAX)
+        return strip
+
+
+class PixelObserver:
+    """NumPy arrays of a rendered surface's pixels, for pixel-based agents and frame capture
+
+    observe() copies the surface into a buffer allocated once and returns
+    the same (height, width, 3) uint8 array every time, updated in place.
+    At full size that is one pass over the 32-bit pixels, with the RGB
+    channels read through a strided view of the buffer. With size and/or
+    grayscale, the surface is instead scaled and converted into one
+    preallocated surface that nothing else draws on, viewed once;
+    grayscale output is (height, width).
+
+    The surface itself is only locked during the copy, so it can be drawn
+    on again while the caller still holds an observation.
+    """
+
+    def __init__(self, surface: pygame.Surface, size: Optional[Tuple[int, int]] = None,
+                 grayscale: bool = False, smooth: bool = True):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Pixel observations need numpy (pip install numpy)")
+        self.surface = surface
+        self.size = size or surface.get_size()
+        self.grayscale = grayscale
+        self.smooth = smooth
+
+        # Scaled and converted frames go here, read through a view that lives as long as it does
+        self.output: Optional[pygame.Surface] = None
+        # Full-size frames are copied here as whole 32-bit pixels when the RGB bytes are adjacent
+        self.pixels: Optional["np.ndarray"] = None
+        if size or grayscale:
+            self.output = pygame.Surface(self.size, 0, surface)
+            # Gray pixels have R = G = B, so the red channel alone is the image
+            pixels = pygame.surfarray.pixels_red if grayscale else pygame.surfarray.pixels3d
+            self.view = pixels(self.output).swapaxes(0, 1)
+        else:
+            width, height = self.size
+            channels = rgb_bytes(surface)
+            if channels is not None:
+                self.pixels = np.empty((height, width), np.uint32)
+                self.view = self.pixels.view(np.uint8).reshape(height, width, 4)[..., channels]
+            else:
+                self.view = np.empty((height, width, 3), np.uint8)
+
+    def observe(self) -> "np.ndarray":
+        """Pixels of the surface as last drawn"""
+        if self.output is None:
+            # The temporary views lock the surface until the copy is done
+            if self.pixels is not None:
+                np.copyto(self.pixels, np.asarray(self.surface.get_view("2")).T)
+            else:
+                np.copyto(self.view, pygame.surfarray.pixels3d(self.surface).swapaxes(0, 1))
+            return self.view
+
+        source = self.surface
+        if self.size != source.get_size():
+            scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            scale(source, self.size, self.output)
+            source = self.output
+        if self.grayscale:
+            pygame.transform.grayscale(source, self.output)
+        return self.view
+
+
+def rgb_bytes(surface: pygame.Surface) -> Optional[slice]:
+    """Slice picking R, G and B in that order out of the bytes of one pixel, if they are evenly spaced"""
+    if surface.get_bytesize() != 4:
+        return None
+    red, green, blue = (shift // 8 if sys.byteorder == "little" else 3 - shift // 8
+                        for shift in surface.get_shifts()[:3])
+    step = green - red
+    if step not in (1, -1) or blue - green != step:
+        return None
+    stop = blue + step
+    return slice(red, stop if stop >= 0 else None, step)
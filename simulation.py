@@ -0,0 +1,1146 @@
+"""
+Pinoy Skater - Simulation
+The game rules without pygame: spawning, movement, scoring and collisions,
+with collision geometry taken from sprite sizes only. Runs headless for
+balancing and regression checks.
+"""
+
+import bisect
+import heapq
+import itertools
+import math
+import random
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Screen
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 700
+FPS = 60
+
+# Fast-forwarding only skips ticks when object speeds are multiples of this,
+# so that moving n ticks at once lands on exactly the same float as n moves
+SKIP_GRID = 1 / 256
+
+# Fixed simulation tick, independent of the display frame rate. Object
+# speeds are in pixels per tick at this rate and scaled for any other.
+TICK_RATE = 60
+TICK = 1.0 / TICK_RATE
+MAX_TICKS_PER_FRAME = 15  # Slower frames drop the backlog instead of spiralling
+
+# Independent random stream per subsystem, all derived from the game seed
+RNG_STREAMS = ("obstacles", "rocks", "items", "hearts")
+
+# Player inputs, applied between ticks and recorded in the input log
+INPUT_ACTIONS = ("jump", "sit", "stand")
+
+# Game speeds (object speed in pixels per tick at TICK_RATE)
+INITIAL_OBSTACLE_INTERVAL = 2.5
+INITIAL_ITEM_INTERVAL = 1.0
+INITIAL_OBJECT_SPEED = 15
+SPEED_INCREASE_INTERVAL = 30.0
+
+# Player constants
+PLAYER_X = 100
+PLAYER_Y = 130
+JUMP_HEIGHT = 180  # Increased for higher jumps
+JUMP_DURATION = 1.0
+HITBOX_MARGIN_X = 25
+
+# Position constants
+BOTTOM_Y = 130
+TOP_Y = 300
+VERY_TOP_Y = 400
+
+# Lives
+MAX_LIVES = 3
+
+# Rocks grow from 50% to 100% over the first minute, in quantized steps
+ROCK_MIN_SCALE = 0.5
+ROCK_MAX_SCALE = 1.0
+ROCK_SCALE_STEPS = 64
+ROCK_GROWTH_TIME = 60.0
+
+# The difficulty curve; Simulation(difficulty=...) overrides any of these (see balance.py)
+DIFFICULTY = {
+    "obstacle_interval": INITIAL_OBSTACLE_INTERVAL,  # Seconds between obstacles
+    "item_interval": INITIAL_ITEM_INTERVAL,  # Seconds between items
+    "object_speed": INITIAL_OBJECT_SPEED,  # Pixels per TICK_RATE tick before any speed up
+    "speed_increase_interval": SPEED_INCREASE_INTERVAL,  # Seconds between speed ups
+    "heart_interval_min": 20.0,  # Seconds between hearts, drawn uniformly from min to max
+    "heart_interval_max": 30.0,
+    "rock_growth_time": ROCK_GROWTH_TIME,  # Seconds over which rocks grow to full size
+}
+
+# Size in pixels of every sprite that takes part in collisions
+SPRITE_SIZES = {
+    "rock": (90, 100),
+    "bird": (100, 50),
+    "candy": (50, 50),
+    "coin": (50, 50),
+    "heart": (50, 50),
+    "skater": (150, 250),
+    "skater_jump": (190, 250),
+    "skater_sitting": (190, 150),
+}
+
+# Entity kinds: lane (bottom edge, measured up from the screen bottom), points, health
+ENTITY_KINDS = {
+    "rock": (BOTTOM_Y, 0, 0),
+    "bird": (TOP_Y, 0, 0),
+    "candy": (VERY_TOP_Y, 200, 0),
+    "coin": (BOTTOM_Y, 100, 0),
+    "heart": (TOP_Y, 50, 1),
+}
+
+# Pooled entities per kind
+POOL_SIZES = {"rock": 5, "bird": 5, "candy": 5, "coin": 10, "heart": 1}
+# High-water mark each pool may grow to when it runs dry
+POOL_LIMITS = {"rock": 20, "bird": 20, "candy": 20, "coin": 40, "heart": 1}
+
+OBSTACLE_KINDS = ("rock", "bird")
+ITEM_KINDS = ("candy", "coin")
+
+# Relative chance of each kind when an obstacle or item spawns
+SPAWN_WEIGHTS = {"rock": 1, "bird": 1, "candy": 1, "coin": 2}
+
+
+def check_difficulty(difficulty: Dict[str, float]):
+    """Raise ValueError unless difficulty overrides known settings with values a game can run on"""
+    unknown = set(difficulty) - set(DIFFICULTY)
+    if unknown:
+        raise ValueError(f"Unknown difficulty settings {sorted(unknown)}")
+    settings = dict(DIFFICULTY, **difficulty)
+    for name, value in settings.items():
+        # Every setting is a speed or a time span
+        if not (math.isfinite(value) and value > 0):
+            raise ValueError(f"{name} must be a positive number, not {value:g}")
+    if settings["heart_interval_min"] > settings["heart_interval_max"]:
+        raise ValueError(f"heart_interval_min ({settings['heart_interval_min']:g}) is greater than "
+                         f"heart_interval_max ({settings['heart_interval_max']:g})")
+
+
+class PlayerState(Enum):
+    """Enum for player animation states"""
+    NORMAL = 0
+    JUMPING = 1
+    SITTING = 2
+
+
+def scale_step(scale: float, min_scale: float = ROCK_MIN_SCALE, max_scale: float = ROCK_MAX_SCALE,
+               steps: int = ROCK_SCALE_STEPS) -> int:
+    """Quantize a scale factor to the closest of steps steps, clamped to min_scale..max_scale
+
+    The defaults are the rock sizes. Rock hitboxes and assets.ScaleCache both
+    quantize through here, so a rock's hitbox and sprite always agree.
+    """
+    return progress_step((scale - min_scale) / (max_scale - min_scale), steps)
+
+
+def progress_step(progress, steps: int = ROCK_SCALE_STEPS):
+    """Quantize progress from 0 (smallest scale) to 1 (largest) to the closest of steps steps
+
+    Takes a float or a NumPy array of them (as VecEnv does), without this module
+    importing NumPy; both round half to even, so they pick the same steps.
+    """
+    if hasattr(progress, "clip"):
+        return (progress * (steps - 1)).round().clip(0, steps - 1).astype(int)
+    return min(max(round(progress * (steps - 1)), 0), steps - 1)
+
+
+def step_scale(step: int, min_scale: float = ROCK_MIN_SCALE, max_scale: float = ROCK_MAX_SCALE,
+               steps: int = ROCK_SCALE_STEPS) -> float:
+    """Return the scale factor a step of scale_step stands for (also for a NumPy array of steps)"""
+    return min_scale + (max_scale - min_scale) * step / (steps - 1)
+
+
+def despawn_x(kind: str, sizes: Dict[str, Tuple[int, int]]) -> int:
+    """Left edge at which an entity of kind is recycled
+
+    That is once the widest kind sharing its lane would be fully off screen,
+    so every lane recycles its entities in the order they move.
+    """
+    lane = ENTITY_KINDS[kind][0]
+    return -max(sizes[other][0] for other, (other_lane, _, _) in ENTITY_KINDS.items() if other_lane == lane)
+
+
+class RandomStream(random.Random):
+    """random.Random that keeps its state from getstate() until the next draw
+
+    Draws are rare (a few per spawn) while a planner snapshots the game
+    every few ticks, so most snapshots reuse the state instead of copying
+    625 words again.
+    """
+
+    def seed(self, *args, **kwargs):
+        self.state = None
+        super().seed(*args, **kwargs)
+
+    def random(self) -> float:
+        self.state = None
+        return super().random()
+
+    def getrandbits(self, k: int) -> int:
+        self.state = None
+        return super().getrandbits(k)
+
+    def getstate(self) -> tuple:
+        if self.state is None:
+            self.state = super().getstate()
+        return self.state
+
+    def setstate(self, state: tuple):
+        super().setstate(state)
+        self.state = state
+
+
+def rng_streams(seed: int) -> Dict[str, random.Random]:
+    """Seed one random stream per subsystem from a single game seed
+
+    String seeds are hashed with SHA-512, so the streams are the same on
+    every run and platform.
+    """
+    return {name: RandomStream(f"{seed}/{name}") for name in RNG_STREAMS}
+
+
+def lerp(previous: float, current: float, alpha: float) -> float:
+    """Position between the previous and current tick, alpha in [0, 1]"""
+    return previous + (current - previous) * alpha
+
+
+def boxes_collide(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+    """Overlap test for (left, top, width, height) boxes, same as pygame.Rect.colliderect"""
+    return (a[2] > 0 and a[3] > 0 and b[2] > 0 and b[3] > 0
+            and a[0] < b[0] + b[2] and b[0] < a[0] + a[2]
+            and a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def swept_collide(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int], dx: float, dy: float) -> bool:
+    """Whether box b overlapped box a at any time during the last tick
+
+    Both boxes are where they ended the tick, and (dx, dy) is how far b moved
+    relative to a during it. Overlapping at the end of the tick counts, so
+    this finds every hit boxes_collide finds plus those stepped over in between.
+    """
+    if a[2] <= 0 or a[3] <= 0 or b[2] <= 0 or b[3] <= 0:
+        return False
+
+    # Slab test: intersect the times at which the boxes overlap along each axis
+    enter, leave = 0.0, 1.0
+    for axis, move in ((0, dx), (1, dy)):
+        start = b[axis] - move
+        low = a[axis] - b[axis + 2]  # b overlaps a while low < position < high
+        high = a[axis] + a[axis + 2]
+        if move == 0:
+            if not low < start < high:
+                return False
+            continue
+        t1 = (low - start) / move
+        t2 = (high - start) / move
+        enter = max(enter, min(t1, t2))
+        leave = min(leave, max(t1, t2))
+        if enter >= leave:
+            return False
+    return True
+
+
+class Entity:
+    """An obstacle or item moving right to left along one lane"""
+
+    __slots__ = ("kind", "lane_y", "points", "health", "is_obstacle", "is_rock",
+                 "base_width", "base_height", "width", "height", "scale_step",
+                 "x", "previous_x", "speed", "active", "despawn_x")
+
+    def __init__(self, kind: str, size: Tuple[int, int], despawn_x: Optional[int] = None):
+        self.kind = kind
+        self.lane_y, self.points, self.health = ENTITY_KINDS[kind]
+        self.is_obstacle = kind in OBSTACLE_KINDS
+        self.is_rock = kind == "rock"
+
+        self.base_width, self.base_height = size
+        self.width, self.height = size
+        self.scale_step: Optional[int] = None
+
+        self.x = SCREEN_WIDTH
+        self.previous_x = self.x  # Position at the previous tick, for interpolation
+        self.speed = 0
+        self.active = False
+        self.despawn_x = -size[0] if despawn_x is None else despawn_x
+
+    def set_scale(self, scale_factor: float):
+        """Resize a rock to the quantized step of scale_factor"""
+        if self.is_rock:
+            step = scale_step(scale_factor)
+            if step == self.scale_step:
+                return
+            self.scale_step = step
+            scale = step_scale(step)
+            self.width = int(self.base_width * scale)
+            self.height = int(self.base_height * scale)
+
+    def reset(self):
+        """Return to the right edge, inactive"""
+        self.x = SCREEN_WIDTH
+        self.previous_x = self.x
+        self.active = False
+
+    def spawn(self):
+        """Enter at the right edge"""
+        self.reset()
+        self.active = True
+
+    def update(self):
+        """Move one step left"""
+        if self.active:
+            self.previous_x = self.x
+            self.x -= self.speed
+
+    @property
+    def offscreen(self) -> bool:
+        """Whether the entity has gone far enough off the left edge to be recycled"""
+        return int(self.x) <= self.despawn_x
+
+    def box(self) -> Tuple[int, int, int, int]:
+        """(left, top, width, height) in screen coordinates"""
+        return int(self.x), SCREEN_HEIGHT - self.lane_y - self.height, self.width, self.height
+
+    def render_box(self, alpha: float) -> Tuple[int, int, int, int]:
+        """box() at a point between the previous and current tick"""
+        x = int(lerp(self.previous_x, self.x, alpha))
+        return x, SCREEN_HEIGHT - self.lane_y - self.height, self.width, self.height
+
+
+class EntityPool:
+    """Entities of one kind, with a free list so acquire and release are O(1)
+
+    When the free list runs dry the pool allocates one more entity, until it
+    holds limit of them; after that acquire gives nothing.
+    """
+
+    def __init__(self, kind: str, size: Tuple[int, int], initial: int, limit: int,
+                 on_grow: Optional[Callable[[Entity], None]] = None, despawn_x: Optional[int] = None):
+        self.kind = kind
+        self.size = size
+        self.limit = max(limit, initial)
+        self.on_grow = on_grow
+        self.despawn_x = despawn_x
+        self.entities = [Entity(kind, size, despawn_x) for _ in range(initial)]
+        self.reset()
+
+    def reset(self):
+        """Take every entity off screen and free it"""
+        for entity in self.entities:
+            entity.reset()
+        self.free = self.entities[::-1]  # pop() hands out the oldest entity first
+        self.active_count = 0
+        self.peak = 0  # Most entities active at once since the reset
+
+    def acquire(self) -> Optional[Entity]:
+        """Spawn a free entity at the right edge, growing the pool if needed"""
+        if self.free:
+            entity = self.free.pop()
+        elif len(self.entities) < self.limit:
+            entity = Entity(self.kind, self.size, self.despawn_x)
+            self.entities.append(entity)
+            if self.on_grow:
+                self.on_grow(entity)
+        else:
+            return None
+        entity.spawn()
+        self.active_count += 1
+        self.peak = max(self.peak, self.active_count)
+        return entity
+
+    def release(self, entity: Entity):
+        """Take an active entity off screen and free it"""
+        entity.reset()
+        self.free.append(entity)
+        self.active_count -= 1
+
+
+class LaneIndex:
+    """Broadphase: one queue of active entities per lane, leftmost first
+
+    Everything moves left at the same speed and enters at the right edge, so
+    each queue stays in x order without sorting. Collision checks only look
+    at lanes the player reaches and stop at the first entity that is still
+    right of the player, and recycling only ever pops the front.
+    """
+
+    def __init__(self, sizes: Dict[str, Tuple[int, int]]):
+        self.queues: Dict[int, deque] = {}
+        # Screen rows each lane's entities can cover, as (top, bottom)
+        self.spans: Dict[int, Tuple[int, int]] = {}
+        for kind, (lane_y, _, _) in ENTITY_KINDS.items():
+            self.queues.setdefault(lane_y, deque())
+            bottom = SCREEN_HEIGHT - lane_y
+            top = min(self.spans.get(lane_y, (bottom, bottom))[0], bottom - sizes[kind][1])
+            self.spans[lane_y] = (top, bottom)
+
+    def clear(self):
+        """Forget every entity"""
+        for queue in self.queues.values():
+            queue.clear()
+
+    def add(self, entity: Entity):
+        """Queue a just spawned entity at the back of its lane"""
+        self.queues[entity.lane_y].append(entity)
+
+    def lanes_within(self, top: int, bottom: int) -> List[deque]:
+        """Queues of the lanes whose rows overlap top..bottom"""
+        return [self.queues[lane_y] for lane_y, (lane_top, lane_bottom) in self.spans.items()
+                if lane_top < bottom and top < lane_bottom]
+
+
+def scale_pools(pools: Dict[str, int], factor: float) -> Dict[str, int]:
+    """Pool sizes (or limits) multiplied by factor, at least one entity each"""
+    return {kind: max(1, round(size * factor)) for kind, size in pools.items()}
+
+
+def weighted_kind(rng: random.Random, kinds: Tuple[str, ...], cumulative: List[float]) -> str:
+    """Pick one of kinds with one draw, given their cumulative spawn weights"""
+    return kinds[bisect.bisect(cumulative, rng.random() * cumulative[-1])]
+
+
+def cumulative_weights(kinds: Tuple[str, ...]) -> List[float]:
+    """Running totals of SPAWN_WEIGHTS over kinds"""
+    totals, total = [], 0
+    for kind in kinds:
+        total += SPAWN_WEIGHTS[kind]
+        totals.append(total)
+    return totals
+
+
+class PlayerBody:
+    """Player position, jump and pose, without any images"""
+
+    def __init__(self, sizes: Dict[str, Tuple[int, int]] = SPRITE_SIZES):
+        self.sizes = {
+            PlayerState.NORMAL: sizes["skater"],
+            PlayerState.JUMPING: sizes["skater_jump"],
+            PlayerState.SITTING: sizes["skater_sitting"],
+        }
+        self.reset()
+
+    def reset(self):
+        """Put the player back on the ground in the normal pose"""
+        self.state = PlayerState.NORMAL
+        self.x = PLAYER_X
+        self.y = PLAYER_Y
+        self.previous_y = self.y  # Height at the previous tick, for interpolation
+        self.is_jumping = False
+        self.jump_timer = 0
+        self.is_sitting = False
+        # Size of the pose at the last update, which is what collisions use
+        self.width, self.height = self.sizes[self.state]
+
+    def update(self, delta_time: float):
+        """Advance the jump and refresh the collision size"""
+        self.previous_y = self.y
+        if self.is_jumping:
+            self.jump_timer += delta_time
+
+            # Simple parabolic jump
+            progress = self.jump_timer / JUMP_DURATION
+            if progress < 1.0:
+                height = 4 * JUMP_HEIGHT * progress * (1 - progress)
+                self.y = PLAYER_Y + height
+            else:
+                # Jump complete
+                self.y = PLAYER_Y
+                self.is_jumping = False
+                self.jump_timer = 0
+                self.state = PlayerState.NORMAL
+        else:
+            self.y = PLAYER_Y
+
+        self.width, self.height = self.sizes[self.state]
+
+    def jump(self):
+        """Make the player jump"""
+        if not self.is_jumping and not self.is_sitting:
+            self.is_jumping = True
+            self.jump_timer = 0
+            self.state = PlayerState.JUMPING
+
+    def sit(self):
+        """Make the player sit"""
+        if not self.is_jumping and not self.is_sitting:
+            self.is_sitting = True
+            self.state = PlayerState.SITTING
+
+    def stand_up(self):
+        """Make the player stand up from sitting"""
+        if self.is_sitting:
+            self.is_sitting = False
+            self.state = PlayerState.NORMAL
+
+    def box(self) -> Tuple[int, int, int, int]:
+        """(left, top, width, height) in screen coordinates"""
+        bottom = int(SCREEN_HEIGHT - self.y)
+        return int(self.x), bottom - self.height, self.width, self.height
+
+    def render_box(self, alpha: float) -> Tuple[int, int, int, int]:
+        """box() at a point between the previous and current tick"""
+        bottom = int(SCREEN_HEIGHT - lerp(self.previous_y, self.y, alpha))
+        return int(self.x), bottom - self.height, self.width, self.height
+
+    def hitbox(self) -> Tuple[int, int, int, int]:
+        """Slightly narrower box used for collisions"""
+        left, top, width, height = self.box()
+        return left + HITBOX_MARGIN_X, top, width - 2 * HITBOX_MARGIN_X, height
+
+    @property
+    def moved_y(self) -> int:
+        """How far the top of the box moved down during the last tick"""
+        return int(SCREEN_HEIGHT - self.y) - int(SCREEN_HEIGHT - self.previous_y)
+
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation ticks"""
+
+    def __init__(self, tick: float = TICK, max_ticks: int = MAX_TICKS_PER_FRAME):
+        self.tick = tick
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.dropped_ticks = 0
+
+    def reset(self):
+        """Forget any time left over from earlier frames"""
+        self.accumulator = 0.0
+
+    def advance(self, frame_time: float) -> int:
+        """Add one frame's time and return how many ticks to run now"""
+        self.accumulator += frame_time
+        ticks = 0
+        # The tolerance keeps 1/60 s frames from alternating between 0 and 2 ticks
+        while self.accumulator >= self.tick - 1e-9:
+            self.accumulator -= self.tick
+            ticks += 1
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """How far the display is between the last tick and the next, for interpolation"""
+        return min(max(self.accumulator / self.tick, 0.0), 1.0)
+
+
+class Scheduler:
+    """Timed callbacks kept in a heap by the tick they are due on
+
+    A callback runs once its tick comes round. If it returns a number of
+    ticks it is scheduled again that much later, which is how repeating
+    spawners are written. Each tick only pops the events that are due, so
+    adding timed content does not make the per-tick loop any longer.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.queue: List[list] = []
+        # Breaks ties so callbacks due on the same tick run in the order they were scheduled
+        self.counter = itertools.count()
+
+    def clear(self):
+        """Drop every event and restart at tick 0"""
+        self.now = 0
+        self.queue.clear()
+
+    def after(self, ticks: int, callback: Callable[[], Optional[int]]) -> list:
+        """Run callback ticks ticks from now (at least one); returns a handle for cancel"""
+        event = [self.now + max(ticks, 1), next(self.counter), callback]
+        heapq.heappush(self.queue, event)
+        return event
+
+    def cancel(self, event: list):
+        """Stop a scheduled event from running"""
+        event[2] = None  # Left in the heap and skipped when it comes up
+
+    @property
+    def next_due(self) -> Optional[int]:
+        """Tick of the earliest pending event, if any"""
+        while self.queue and self.queue[0][2] is None:
+            heapq.heappop(self.queue)
+        return self.queue[0][0] if self.queue else None
+
+    def advance(self, ticks: int = 1):
+        """Move the clock on and run every event that has come due, in order"""
+        self.now += ticks
+        queue = self.queue
+        while queue and queue[0][0] <= self.now:
+            event = heapq.heappop(queue)
+            callback = event[2]
+            if callback is None:
+                continue
+            again = callback()
+            if again is not None:
+                event[0] += max(again, 1)
+                event[1] = next(self.counter)
+                heapq.heappush(queue, event)
+
+
+class Simulation:
+    """One game of Pinoy Skater: spawning, movement, scoring and collisions
+
+    The game advances in fixed ticks of 1 / tick_rate seconds. step() runs
+    one tick and returns the events it produced, as ("hit", entity) for an
+    obstacle that hit the player and ("collect", entity) for a picked up item
+    or heart. Given the same seed, tick rate and input log, every run plays
+    out identically. Collisions are swept over each tick, so a low tick rate
+    or a high speed never lets an object pass through the player. Spawning
+    and the difficulty ramps are events on self.scheduler, timed by the
+    values of DIFFICULTY updated with difficulty.
+    """
+
+    def __init__(self, sizes: Dict[str, Tuple[int, int]] = SPRITE_SIZES, seed: Optional[int] = None,
+                 pool_sizes: Dict[str, int] = POOL_SIZES, tick_rate: int = TICK_RATE,
+                 pool_limits: Dict[str, int] = POOL_LIMITS, spawn_rate: float = 1.0,
+                 difficulty: Dict[str, float] = DIFFICULTY):
+        check_difficulty(difficulty)
+        self.difficulty = dict(DIFFICULTY, **difficulty)
+        self.tick = 1.0 / tick_rate
+        self.tick_rate = tick_rate
+        self.spawn_rate = spawn_rate  # Spawns this many times as often as normal (stress tests)
+        self.speed_scale = TICK_RATE / tick_rate  # Object speeds are per TICK_RATE tick
+        self.sizes = dict(SPRITE_SIZES, **sizes)
+        self.player = PlayerBody(self.sizes)
+        self.scheduler = Scheduler()
+        self.obstacle_weights = cumulative_weights(OBSTACLE_KINDS)
+        self.item_weights = cumulative_weights(ITEM_KINDS)
+        self.rock_scale = ROCK_MIN_SCALE
+        self.build_entities(pool_sizes, dict(POOL_LIMITS, **pool_limits))
+        self.reset(seed)
+
+    def build_entities(self, pool_sizes: Dict[str, int], pool_limits: Dict[str, int]):
+        """Create one pool per kind"""
+        self.pools = {kind: EntityPool(kind, self.sizes[kind], pool_sizes[kind], pool_limits[kind], self.on_grow,
+                                       despawn_x(kind, self.sizes))
+                      for kind in OBSTACLE_KINDS + ITEM_KINDS + ("heart",)}
+        self.lanes = LaneIndex(self.sizes)
+        # Every entity in a fixed order (rocks, birds / candy, coins), grown ones appended
+        self.obstacles = [entity for kind in OBSTACLE_KINDS for entity in self.pools[kind].entities]
+        self.items = [entity for kind in ITEM_KINDS for entity in self.pools[kind].entities]
+        self.heart = self.pools["heart"].entities[0] if self.pools["heart"].entities else None
+
+    def on_grow(self, entity: Entity):
+        """Track an entity a pool just allocated"""
+        if entity.is_obstacle:
+            self.obstacles.append(entity)
+            entity.set_scale(self.rock_scale)
+        elif entity.kind == "heart":
+            self.heart = entity
+        else:
+            self.items.append(entity)
+
+    def reset(self, seed: Optional[int] = None):
+        """Start a new game, reusing every pooled entity
+
+        Without a seed a fresh one is picked, and kept in self.seed so the
+        game can be replayed.
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rngs = rng_streams(self.seed)
+        self.input_log: List[Tuple[int, str]] = []
+
+        self.score = 0
+        self.lives = MAX_LIVES
+        self.time_elapsed = 0
+        self.speed_multiplier = 1.0
+        self.frames = 0
+
+        self.player.reset()
+        self.reset_entities()
+        self.schedule_events()
+
+    def ticks(self, seconds: float) -> int:
+        """Whole ticks until seconds have passed"""
+        return max(1, math.ceil(seconds * self.tick_rate - 1e-9))
+
+    def schedule_events(self):
+        """Register the spawners and difficulty ramps of a new game"""
+        scheduler = self.scheduler
+        scheduler.clear()
+        scheduler.after(1, self.grow_rocks)
+        scheduler.after(self.ticks(self.difficulty["speed_increase_interval"]), self.speed_up)
+        scheduler.after(self.spawn_period(self.difficulty["obstacle_interval"])[0], self.obstacle_spawner)
+        scheduler.after(self.spawn_period(self.difficulty["item_interval"])[0], self.item_spawner)
+        scheduler.after(self.heart_ticks(), self.heart_spawner)
+
+    def spawn_period(self, interval: float) -> Tuple[int, int]:
+        """(ticks between spawns, entities per spawn) to spawn once every interval / spawn_rate seconds
+
+        Periods shorter than a tick become several spawns every tick.
+        """
+        period = interval / self.spawn_rate
+        if period >= self.tick:
+            return self.ticks(period), 1
+        return 1, round(self.tick / period)
+
+    def heart_ticks(self) -> int:
+        """Random 20-30 seconds (by default) until the next heart"""
+        difficulty = self.difficulty
+        interval = self.rngs["hearts"].uniform(difficulty["heart_interval_min"], difficulty["heart_interval_max"])
+        return self.ticks(interval / self.spawn_rate)
+
+    def growth_scale(self, frames: int) -> float:
+        """Scale of every rock after frames ticks of the first minute"""
+        rock_scale_progress = min(frames * self.tick / self.difficulty["rock_growth_time"], 1.0)
+        return ROCK_MIN_SCALE + rock_scale_progress * (ROCK_MAX_SCALE - ROCK_MIN_SCALE)
+
+    def grow_rocks(self) -> Optional[int]:
+        """For the first minute, all rocks grow uniformly
+
+        After 1 minute, rocks spawn with random sizes (set in spawn_obstacle).
+        Rock sizes are quantized, so this only runs again on the tick the
+        next size step is reached.
+        """
+        growth_time = self.difficulty["rock_growth_time"]
+        if self.time_elapsed >= growth_time:
+            return None
+        self.scale_rocks(self.growth_scale(self.frames))
+        step = scale_step(self.rock_scale)
+        ticks = 1
+        while ((self.frames + ticks) * self.tick < growth_time
+               and scale_step(self.growth_scale(self.frames + ticks)) == step):
+            ticks += 1
+        return ticks
+
+    def speed_up(self) -> int:
+        """Everything gets faster every SPEED_INCREASE_INTERVAL seconds"""
+        self.speed_multiplier += 0.5
+        return self.ticks(self.difficulty["speed_increase_interval"])
+
+    def obstacle_spawner(self) -> int:
+        """Spawn an obstacle every INITIAL_OBSTACLE_INTERVAL seconds"""
+        ticks, count = self.spawn_period(self.difficulty["obstacle_interval"])
+        for _ in range(count):
+            self.spawn_obstacle()
+        return ticks
+
+    def item_spawner(self) -> int:
+        """Spawn an item every INITIAL_ITEM_INTERVAL seconds"""
+        ticks, count = self.spawn_period(self.difficulty["item_interval"])
+        for _ in range(count):
+            self.spawn_item()
+        return ticks
+
+    def heart_spawner(self) -> int:
+        """Spawn the heart, then wait another 20-30 seconds"""
+        self.spawn_heart()
+        return self.heart_ticks()
+
+    def reset_entities(self):
+        """Take every pooled entity off screen"""
+        for pool in self.pools.values():
+            pool.reset()
+        self.lanes.clear()
+        self.scale_rocks(ROCK_MIN_SCALE)  # Rocks start at 50% size
+
+    def release(self, entity: Entity):
+        """Return an entity to its pool"""
+        self.pools[entity.kind].release(entity)
+
+    def pool_stats(self) -> Dict[str, Tuple[int, int]]:
+        """(entities allocated, most active at once) of every pool"""
+        return {kind: (len(pool.entities), pool.peak) for kind, pool in self.pools.items()}
+
+    def entities(self) -> List[Entity]:
+        """Every pooled obstacle and item, including the heart"""
+        return self.obstacles + self.items + ([self.heart] if self.heart else [])
+
+    def entity_states(self) -> List[tuple]:
+        """(kind, x, previous_x, width, height) of every active entity, sorted, for comparing runs"""
+        return sorted((entity.kind, entity.x, entity.previous_x, entity.width, entity.height)
+                      for entity in self.entities() if entity.active)
+
+    def snapshot(self) -> tuple:
+        """Everything that decides how the game goes on from here, for restore()
+
+        A snapshot is a tuple of plain values and references to this
+        simulation's own entities, so it is cheap to take, never changes
+        and can only be restored into the simulation that took it.
+        """
+        player = self.player
+        return (self.seed, self.frames, self.time_elapsed, self.score, self.lives, self.speed_multiplier,
+                self.rock_scale, len(self.input_log),
+                (player.state, player.y, player.previous_y, player.is_jumping, player.jump_timer, player.is_sitting,
+                 player.width, player.height),
+                tuple(rng.getstate() for rng in self.rngs.values()),
+                self.scheduler.now, tuple(map(tuple, self.scheduler.queue)),
+                self.snapshot_entities())
+
+    def restore(self, snapshot: tuple):
+        """Put the game back in the state snapshot() returned, ready to step on from there"""
+        (self.seed, self.frames, self.time_elapsed, self.score, self.lives, self.speed_multiplier,
+         self.rock_scale, inputs, player_state, rng_states, now, events, entities) = snapshot
+        del self.input_log[inputs:]
+
+        player = self.player
+        (player.state, player.y, player.previous_y, player.is_jumping, player.jump_timer, player.is_sitting,
+         player.width, player.height) = player_state
+        for rng, state in zip(self.rngs.values(), rng_states):
+            if rng.state is not state:  # Unless nothing was drawn since
+                rng.setstate(state)
+
+        # The heap is copied as it is, so it stays a heap
+        self.scheduler.now = now
+        self.scheduler.queue = [list(event) for event in events]
+        self.restore_entities(entities)
+
+    def snapshot_entities(self) -> tuple:
+        """State of every entity, pool and lane, for snapshot()"""
+        return (len(self.obstacles), len(self.items), self.heart,
+                tuple((entity, entity.x, entity.previous_x, entity.speed, entity.active, entity.width,
+                       entity.height, entity.scale_step) for entity in self.entities()),
+                tuple((pool, tuple(pool.free), len(pool.entities), pool.active_count, pool.peak)
+                      for pool in self.pools.values()),
+                tuple(tuple(queue) for queue in self.lanes.queues.values()))
+
+    def restore_entities(self, entities: tuple):
+        """Undo everything that happened to the entities since snapshot_entities(), including pool growth"""
+        obstacles, items, self.heart, states, pools, lanes = entities
+        del self.obstacles[obstacles:]
+        del self.items[items:]
+        for entity, x, previous_x, speed, active, width, height, step in states:
+            entity.x = x
+            entity.previous_x = previous_x
+            entity.speed = speed
+            entity.active = active
+            entity.width = width
+            entity.height = height
+            entity.scale_step = step
+        for pool, free, size, active_count, peak in pools:
+            pool.free = list(free)
+            del pool.entities[size:]
+            pool.active_count = active_count
+            pool.peak = peak
+        for queue, queued in zip(self.lanes.queues.values(), lanes):
+            queue.clear()
+            queue.extend(queued)
+
+    @property
+    def game_over(self) -> bool:
+        return self.lives <= 0
+
+    def input(self, action: str):
+        """Apply a player input before the next tick and record it"""
+        if action == "jump":
+            self.player.jump()
+        elif action == "sit":
+            self.player.sit()
+        elif action == "stand":
+            self.player.stand_up()
+        else:
+            raise ValueError(f"Unknown input {action!r}")
+        self.input_log.append((self.frames, action))
+
+    def step(self) -> List[Tuple[str, Entity]]:
+        """Advance the game by one tick"""
+        self.frames += 1
+        self.time_elapsed = self.frames * self.tick
+
+        # Update player
+        self.player.update(self.tick)
+
+        # Spawn and ramp up whatever is due this tick
+        self.scheduler.advance()
+
+        # Move everything
+        self.move_entities(self.object_speed)
+
+        return self.check_collisions()
+
+    @property
+    def object_speed(self) -> float:
+        """Pixels every entity moves left per tick"""
+        return self.difficulty["object_speed"] * self.speed_multiplier * self.speed_scale
+
+    def idle_ticks(self, limit: int) -> int:
+        """How many of the next ticks (at most limit) will do nothing but move things
+
+        On those ticks no scheduled event is due, nothing touches the player
+        and nothing leaves the screen, so skip() can do them in one go. The
+        answer may be a tick short, never long. Nothing is skipped unless
+        the speed is a multiple of SKIP_GRID.
+
+        Something spawns every second and entities are near the player most
+        of the time, so stretches are short: replaying autopilot games comes
+        out about 1.7x faster at 30 ticks per second, 2.7x at 60 and 3.5x at
+        120, not by an order of magnitude.
+        """
+        next_due = self.scheduler.next_due
+        if next_due is not None:
+            limit = min(limit, next_due - self.scheduler.now - 1)
+        speed = self.object_speed
+        if limit <= 0 or not (speed / SKIP_GRID).is_integer():
+            return 0
+
+        player = self.player
+        hitbox = player.hitbox()
+        still = (not player.is_jumping and player.y == player.previous_y
+                 and (player.width, player.height) == player.sizes[player.state])
+        if not still:
+            # The player moves or changes pose: keep clear of it in every lane, at its widest
+            widest = max(width for width, _ in player.sizes.values())
+            hitbox = (hitbox[0], 0, widest - 2 * HITBOX_MARGIN_X, SCREEN_HEIGHT)
+        return self.entity_idle_ticks(limit, speed, hitbox)
+
+    def entity_idle_ticks(self, limit: int, speed: float, hitbox: Tuple[int, int, int, int]) -> int:
+        """Ticks, at most limit, before any entity could be recycled or reach hitbox"""
+        hitbox_right = hitbox[0] + hitbox[2]
+        # Ticks until the front entity of a lane is recycled
+        for queue in self.lanes.queues.values():
+            if queue:
+                limit = min(limit, math.floor((queue[0].x - queue[0].despawn_x) / speed) - 1)
+        # Ticks until the first entity level with the player and not yet past it reaches
+        # it; rocks only grow up to their base size, so that is used for the ones still growing
+        hitbox_bottom = hitbox[1] + hitbox[3]
+        for queue in self.lanes.lanes_within(hitbox[1], hitbox_bottom):
+            for entity in queue:
+                bottom = SCREEN_HEIGHT - entity.lane_y
+                if (int(entity.x) + entity.base_width > hitbox[0]
+                        and bottom - entity.base_height < hitbox_bottom and hitbox[1] < bottom):
+                    limit = min(limit, math.floor((entity.x - hitbox_right) / speed) - 1)
+                    break
+        return max(limit, 0)
+
+    def skip(self, ticks: int):
+        """Advance ticks idle ticks (see idle_ticks) at once"""
+        player = self.player
+        if player.is_jumping:
+            # Tick by tick, so the jump comes out exactly as step() would have it
+            for _ in range(ticks):
+                player.update(self.tick)
+        else:
+            player.previous_y = player.y
+        self.frames += ticks
+        self.time_elapsed = self.frames * self.tick
+        self.scheduler.advance(ticks)
+        self.skip_entities(ticks, self.object_speed)
+
+    def skip_entities(self, ticks: int, speed: float):
+        """Move every active entity ticks times speed pixels left"""
+        for queue in self.lanes.queues.values():
+            for entity in queue:
+                entity.speed = speed
+                entity.previous_x = entity.x - (ticks - 1) * speed
+                entity.x -= ticks * speed
+
+    def scale_rocks(self, scale_factor: float):
+        """Resize every rock"""
+        self.rock_scale = scale_factor
+        for obstacle in self.obstacles:
+            if obstacle.is_rock:
+                obstacle.set_scale(scale_factor)
+
+    def move_entities(self, speed: float):
+        """Move every active entity speed pixels left"""
+        for queue in self.lanes.queues.values():
+            for entity in queue:
+                entity.speed = speed
+                entity.update()
+
+    def next_obstacle(self, left: int, right: int) -> Optional[Tuple[float, bool]]:
+        """(x, is_rock) of the leftmost active obstacle overlapping left..right, if any"""
+        threat = None
+        for obstacle in self.obstacles:
+            if obstacle.active and left - obstacle.width < obstacle.x < right:
+                if threat is None or obstacle.x < threat.x:
+                    threat = obstacle
+        return (threat.x, threat.is_rock) if threat else None
+
+    def spawn(self, kind: str) -> Optional[Entity]:
+        """Take an entity of kind from its pool and put it at the back of its lane"""
+        entity = self.pools[kind].acquire()
+        if entity:
+            self.lanes.add(entity)
+        return entity
+
+    def spawn_obstacle(self):
+        """Spawn a random obstacle"""
+        obstacle = self.spawn(weighted_kind(self.rngs["obstacles"], OBSTACLE_KINDS, self.obstacle_weights))
+
+        # After 1 minute, assign random size to rocks for variety
+        if obstacle and obstacle.is_rock and self.time_elapsed >= self.difficulty["rock_growth_time"]:
+            obstacle.set_scale(self.rngs["rocks"].uniform(ROCK_MIN_SCALE, ROCK_MAX_SCALE))
+
+    def spawn_item(self):
+        """Spawn a random item"""
+        self.spawn(weighted_kind(self.rngs["items"], ITEM_KINDS, self.item_weights))
+
+    def spawn_heart(self):
+        """Spawn the heart (rare health item) unless it is already out"""
+        self.spawn("heart")
+
+    def check_collisions(self) -> List[Tuple[str, Entity]]:
+        """Apply every collision between the player and the active entities during the last tick
+
+        Only the lanes the player covered during the tick are searched, each
+        from its front up to the first entity still right of the player.
+        Entities that left the screen are recycled afterwards, so one that
+        crossed the player on its way out still counts.
+        """
+        hitbox = self.player.hitbox()
+        hitbox_right = hitbox[0] + hitbox[2]
+        player_dy = self.player.moved_y
+        top = min(hitbox[1], hitbox[1] - player_dy)
+        bottom = max(hitbox[1], hitbox[1] - player_dy) + hitbox[3]
+
+        touched = []
+        for queue in self.lanes.lanes_within(top, bottom):
+            for entity in queue:
+                left = int(entity.x)
+                if left >= hitbox_right:
+                    break  # This one and everything behind it is still right of the player
+                # Entities only move left and the player only up and down
+                if swept_collide(hitbox, entity.box(), left - int(entity.previous_x), -player_dy):
+                    touched.append(entity)
+
+        # Obstacles first, then items, then the heart, so a heart caught in the
+        # same tick as a hit still restores the life it cost
+        touched.sort(key=lambda entity: (not entity.is_obstacle, entity.kind == "heart"))
+        events = []
+        for entity in touched:
+            self.lanes.queues[entity.lane_y].remove(entity)
+            self.release(entity)
+            if entity.is_obstacle:
+                self.lives -= 1
+                events.append(("hit", entity))
+            else:
+                self.score += entity.points
+                # Restore health
+                if entity.health:
+                    self.lives = min(self.lives + entity.health, MAX_LIVES)
+                events.append(("collect", entity))
+
+        for queue in self.lanes.queues.values():
+            while queue and queue[0].offscreen:
+                self.release(queue.popleft())
+
+        return events
+
+
+def autopilot(sim: Simulation):
+    """A simple reflex player: jump rocks, duck birds, otherwise stand"""
+    player = sim.player
+    reach = sim.speed_multiplier * sim.difficulty["object_speed"] * TICK_RATE * 0.2  # 0.2 s ahead
+    left, _, width, _ = player.hitbox()
+    threat = sim.next_obstacle(left, left + width + reach)
+    if threat is None or threat[1]:
+        if player.is_sitting:
+            sim.input("stand")
+        if threat is not None and not player.is_jumping:
+            sim.input("jump")
+    elif not player.is_sitting and not player.is_jumping:
+        sim.input("sit")
+
+
+def replay(seed: int, input_log: List[Tuple[int, str]], frames: int, tick_rate: int = TICK_RATE,
+           simulation: type = Simulation, fast: bool = False) -> Simulation:
+    """Play back a recorded game tick for tick
+
+    With fast, stretches of ticks in which nothing but movement happens are
+    skipped in one go; the game ends in exactly the same state.
+    """
+    sim = simulation(seed=seed, tick_rate=tick_rate)
+    inputs = iter(input_log)
+    pending = next(inputs, None)
+    while sim.frames < frames and not sim.game_over:
+        while pending is not None and pending[0] == sim.frames:
+            sim.input(pending[1])
+            pending = next(inputs, None)
+        if fast:
+            # Never skip past the next input
+            until = frames if pending is None else min(frames, pending[0])
+            ticks = sim.idle_ticks(until - sim.frames)
+            if ticks:
+                sim.skip(ticks)
+                continue
+        sim.step()
+    return sim
+
+
+def fingerprint(sim: Simulation) -> tuple:
+    """Everything that decides how a game goes on from here, for comparing runs"""
+    player = sim.player
+    return (sim.frames, sim.score, sim.lives, sim.speed_multiplier, sim.rock_scale,
+            player.state, player.y, player.previous_y, player.jump_timer, tuple(sim.entity_states()),
+            sim.scheduler.next_due, tuple(rng.getstate() for rng in sim.rngs.values()))
+
+
+def check_fast_forward(seed: Optional[int], frames: int, tick_rate: int = TICK_RATE,
+                       simulation: type = Simulation) -> List[dict]:
+    """Compare fast-forwarded games against the same games stepped tick by tick
+
+    One game is played by the autopilot and its recorded inputs are then
+    replayed fast-forwarded; the other has no inputs at all. Returns, for
+    each, whether both runs ended in the same state and how much faster
+    the fast-forward was.
+    """
+    sim = simulation(seed=seed, tick_rate=tick_rate)
+    while sim.frames < frames and not sim.game_over:
+        autopilot(sim)
+        sim.step()
+
+    results = []
+    for name, input_log in (("autopilot", sim.input_log), ("no input", [])):
+        runs = []
+        for fast in (False, True):
+            start = time.perf_counter()
+            runs.append(replay(sim.seed, input_log, frames, tick_rate, simulation, fast=fast))
+            runs.append(time.perf_counter() - start)
+        stepped, stepped_seconds, skipped, skipped_seconds = runs
+        results.append({
+            "game": name,
+            "frames": stepped.frames,
+            "match": fingerprint(stepped) == fingerprint(skipped),
+            "speedup": stepped_seconds / skipped_seconds if skipped_seconds > 0 else float("inf"),
+        })
+    return results
+
+
+def run_headless(frames: int, seed: Optional[int] = None,
+                 policy: Optional[Callable[[Simulation], None]] = None, tick_rate: int = TICK_RATE,
+                 simulation: type = Simulation, pool_sizes: Dict[str, int] = POOL_SIZES,
+                 pool_limits: Dict[str, int] = POOL_LIMITS, fast: bool = False, spawn_rate: float = 1.0,
+                 difficulty: Dict[str, float] = DIFFICULTY) -> dict:
+    """Simulate one game for up to frames ticks (or until game over) as fast as possible
+
+    simulation may be Simulation or a subclass such as VectorSimulation.
+    fast skips idle ticks (see Simulation.idle_ticks), which only works
+    without a policy, since a policy may act on any tick.
+    """
+    if fast and policy:
+        raise ValueError("Fast-forward needs a game without a policy")
+    sim = simulation(seed=seed, tick_rate=tick_rate, pool_sizes=pool_sizes, pool_limits=pool_limits,
+                     spawn_rate=spawn_rate, difficulty=difficulty)
+    start = time.perf_counter()
+    while sim.frames < frames and not sim.game_over:
+        if fast:
+            ticks = sim.idle_ticks(frames - sim.frames)
+            if ticks:
+                sim.skip(ticks)
+                continue
+        if policy:
+            policy(sim)
+        sim.step()
+    elapsed = time.perf_counter() - start
+    return {
+        "seed": sim.seed,
+        "score": sim.score,
+        "lives": sim.lives,
+        "frames": sim.frames,
+        "game_time": sim.time_elapsed,
+        "seconds": elapsed,
+        "fps": sim.frames / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of values, for summing up headless runs"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))]
@@ -0,0 +1,128 @@
+"""
+Pinoy Skater - Stress Test
+Runs the game with many times the usual number of entities on screen and
+reports per-frame percentiles of the update, collision and draw phases,
+to show where the engine stops holding 60 FPS
+
+Usage: python stress.py [factor ...] [--headless] [--frames N] [--numpy]
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from simulation import FPS, MAX_LIVES, POOL_LIMITS, POOL_SIZES, Simulation, percentile, scale_pools
+
+# Frame budget at the target frame rate, in milliseconds
+FRAME_BUDGET = 1000 / FPS
+
+PERCENTILES = (50, 95, 99)
+
+
+def time_collisions(sim: Simulation, times: List[float]):
+    """Record how long every collision check of sim takes
+
+    Lives are topped up after each check, so the scene keeps running
+    however often the player is hit.
+    """
+    check_collisions = sim.check_collisions
+
+    def timed():
+        start = time.perf_counter()
+        events = check_collisions()
+        times.append(time.perf_counter() - start)
+        sim.lives = MAX_LIVES
+        return events
+
+    sim.check_collisions = timed
+
+
+def run_headless(factor: float, frames: int, seed: int, vectorized: bool = False) -> Dict[str, List[float]]:
+    """Simulate frames ticks at factor times the entities, timing each phase"""
+    simulation = Simulation
+    if vectorized:
+        from entity_store import VectorSimulation
+        simulation = VectorSimulation
+    sim = simulation(seed=seed, pool_sizes=scale_pools(POOL_SIZES, factor),
+                     pool_limits=scale_pools(POOL_LIMITS, factor), spawn_rate=factor)
+    collisions = []
+    time_collisions(sim, collisions)
+
+    steps = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        sim.step()
+        steps.append(time.perf_counter() - start)
+    return {
+        "update": [step - collision for step, collision in zip(steps, collisions)],
+        "collision": collisions,
+        "active": sum(peak for _, peak in sim.pool_stats().values()),
+    }
+
+
+def run_rendered(factor: float, frames: int, seed: int) -> Dict[str, List[float]]:
+    """Play frames display frames at factor times the entities, timing each phase"""
+    # Imported here so headless runs never open a window
+    from main import GameState, PinoySkaterGame
+
+    game = PinoySkaterGame(stress=factor)
+    game.setup_game(seed=seed)
+    game.game_state = GameState.PLAYING
+    collisions = []
+    time_collisions(game.sim, collisions)
+
+    updates = []
+    draws = []
+    for _ in range(frames):
+        before = len(collisions)
+        start = time.perf_counter()
+        game.update(1 / FPS)
+        middle = time.perf_counter()
+        game.draw()
+        draws.append(time.perf_counter() - middle)
+        # A frame may run several ticks (or none); all of their collision checks count
+        collided = sum(collisions[before:])
+        updates.append(middle - start - collided)
+        collisions[before:] = [collided]
+    return {
+        "update": updates,
+        "collision": collisions,
+        "draw": draws,
+        "active": sum(peak for _, peak in game.sim.pool_stats().values()),
+    }
+
+
+def report(factor: float, results: Dict[str, List[float]]):
+    """Print the percentiles of every phase and whether the frame fits the budget"""
+    phases = [name for name in ("update", "collision", "draw") if name in results]
+    print(f"{factor:g}x entities (up to {results['active']} on screen)")
+    for name in phases:
+        millis = [seconds * 1000 for seconds in results[name]]
+        columns = "  ".join(f"p{percent} {percentile(millis, percent):7.3f}" for percent in PERCENTILES)
+        print(f"  {name:<9}  {columns}  max {max(millis):7.3f} ms")
+    totals = [sum(phase) * 1000 for phase in zip(*(results[name] for name in phases))]
+    worst = percentile(totals, 99)
+    verdict = "holds" if worst <= FRAME_BUDGET else "misses"
+    print(f"  {'frame':<9}  p99 {worst:.3f} ms, {verdict} {FPS} FPS ({FRAME_BUDGET:.1f} ms budget)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinoy Skater stress test")
+    parser.add_argument("factors", type=float, nargs="*", default=[1, 10, 100, 1000],
+                        help="multiples of the normal pool sizes and spawn rates to try")
+    parser.add_argument("--headless", action="store_true", help="simulate only, without drawing")
+    parser.add_argument("--frames", type=int, default=FPS * 10, help="frames to run at every factor")
+    parser.add_argument("--seed", type=int, default=0, help="game seed")
+    parser.add_argument("--numpy", action="store_true", help="keep entities in NumPy arrays (headless only)")
+    args = parser.parse_args()
+
+    for factor in args.factors:
+        if args.headless:
+            results = run_headless(factor, args.frames, args.seed, args.numpy)
+        else:
+            results = run_rendered(factor, args.frames, args.seed)
+        report(factor, results)
+
+
+if __name__ == "__main__":
+    main()
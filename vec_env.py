@@ -0,0 +1,376 @@
+"""
+Pinoy Skater - Vector Environment
+N independent games advanced in lockstep as NumPy arrays, for evaluating
+policies at millions of game steps per second on a CPU. Needs numpy.
+"""
+
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional, only for batched training and evaluation
+    np = None
+
+from env import ACTIONS, ENTITY_FEATURES, KIND_CODES, LANES, LIFE_VALUE, PLAYER_FEATURES
+from simulation import (DIFFICULTY, ENTITY_KINDS, HITBOX_MARGIN_X, ITEM_KINDS, JUMP_DURATION, JUMP_HEIGHT,
+                        MAX_LIVES, OBSTACLE_KINDS, PLAYER_X, PLAYER_Y, POOL_SIZES, RNG_STREAMS, SCREEN_HEIGHT,
+                        SCREEN_WIDTH, SPRITE_SIZES, TICK_RATE, check_difficulty, cumulative_weights, despawn_x,
+                        progress_step, step_scale)
+
+NUMPY_AVAILABLE = np is not None
+
+JUMP, SIT, STAND = (ACTIONS.index(action) for action in ("jump", "sit", "stand"))
+
+
+class VecEnv:
+    """num_envs games of Pinoy Skater stepped together by step(actions)
+
+    Plays by the rules of Simulation: the same spawn timers, speed and rock
+    ramps, jump, swept collisions, scoring and recycling, with a fixed
+    number of entity slots per kind and game (pool_sizes; a spawn with no
+    free slot is dropped, like a pool at its limit), timed by the values of
+    DIFFICULTY updated with difficulty. Random draws come from one NumPy
+    generator per subsystem (RNG_STREAMS) for the whole batch, so extra
+    draws in one subsystem never shift another's, but a game does not
+    replay a Simulation with the same seed. Observations and rewards are laid out
+    as in env.SkaterEnv, one row per game. Finished games are reset at once;
+    step() reports how they ended in its info.
+    """
+
+    def __init__(self, num_envs: int, per_lane: int = 2, tick_rate: int = TICK_RATE,
+                 max_frames: Optional[int] = None, life_value: float = LIFE_VALUE,
+                 pool_sizes: Dict[str, int] = POOL_SIZES, sizes: Dict[str, Tuple[int, int]] = SPRITE_SIZES,
+                 seed: Optional[int] = None, difficulty: Dict[str, float] = DIFFICULTY):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("VecEnv needs numpy (pip install numpy)")
+        check_difficulty(difficulty)
+        self.difficulty = dict(DIFFICULTY, **difficulty)
+        self.num_envs = num_envs
+        self.per_lane = per_lane
+        self.max_frames = max_frames
+        self.life_value = life_value
+        self.observation_size = PLAYER_FEATURES + len(LANES) * per_lane * ENTITY_FEATURES
+        self.action_count = len(ACTIONS)
+        self.rngs = self.seed_streams(seed)
+
+        # Timing, in ticks, as Simulation.ticks rounds it
+        self.tick = 1.0 / tick_rate
+        self.tick_rate = tick_rate
+        self.speed_scale = TICK_RATE / tick_rate  # Object speeds are per TICK_RATE tick
+        difficulty = self.difficulty
+        self.obstacle_ticks = self.ticks(difficulty["obstacle_interval"])
+        self.item_ticks = self.ticks(difficulty["item_interval"])
+        self.speed_ticks = self.ticks(difficulty["speed_increase_interval"])
+        self.object_speed = difficulty["object_speed"] * self.speed_scale
+        self.rock_growth_time = difficulty["rock_growth_time"]
+
+        # One column per entity slot, grouped by kind and the kinds by lane, so every lane
+        # is one slice of columns; these describe the columns
+        sizes = dict(SPRITE_SIZES, **sizes)
+        kinds = [kind for lane_y in LANES for kind in OBSTACLE_KINDS + ITEM_KINDS + ("heart",)
+                 if ENTITY_KINDS[kind][0] == lane_y for _ in range(pool_sizes[kind])]
+        self.columns = {kind: np.array([column for column, other in enumerate(kinds) if other == kind], dtype=np.int64)
+                        for kind in ENTITY_KINDS}
+        self.lane_columns = []
+        for lane_y in LANES:
+            columns = [column for column, kind in enumerate(kinds) if ENTITY_KINDS[kind][0] == lane_y]
+            self.lane_columns.append(slice(columns[0], columns[-1] + 1) if columns else slice(0, 0))
+        self.lane_y = np.array([ENTITY_KINDS[kind][0] for kind in kinds], dtype=np.int64)
+        self.points = np.array([ENTITY_KINDS[kind][1] for kind in kinds], dtype=np.int64)
+        self.health = np.array([ENTITY_KINDS[kind][2] for kind in kinds], dtype=np.int64)
+        self.is_obstacle = np.isin(kinds, OBSTACLE_KINDS)
+        self.kind_code = np.array([KIND_CODES[kind] for kind in kinds], dtype=np.float32)
+        self.base_width = np.array([sizes[kind][0] for kind in kinds], dtype=np.int64)
+        self.base_height = np.array([sizes[kind][1] for kind in kinds], dtype=np.int64)
+        self.despawn_x = np.array([despawn_x(kind, sizes) for kind in kinds], dtype=np.int64)
+        self.obstacle_weights = cumulative_weights(OBSTACLE_KINDS)
+        self.item_weights = cumulative_weights(ITEM_KINDS)
+
+        # Player poses: (width, height) standing, jumping and sitting
+        self.poses = np.array([sizes["skater"], sizes["skater_jump"], sizes["skater_sitting"]], dtype=np.int64)
+
+        # Per game state
+        shape = (num_envs, len(kinds))
+        self.frames = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.lives = np.zeros(num_envs, dtype=np.int64)
+        self.heart_due = np.zeros(num_envs, dtype=np.int64)
+        self.y = np.zeros(num_envs)
+        self.previous_y = np.zeros(num_envs)
+        self.jump_timer = np.zeros(num_envs)
+        self.jumping = np.zeros(num_envs, dtype=bool)
+        self.sitting = np.zeros(num_envs, dtype=bool)
+        self.pose = np.zeros(num_envs, dtype=np.int64)  # Row of self.poses applied at the last tick
+        self.rock_step = np.zeros(num_envs, dtype=np.int64)  # Size step all rocks grew to in the first minute
+        self.x = np.zeros(shape)
+        self.previous_x = np.zeros(shape)
+        self.active = np.zeros(shape, dtype=bool)
+        self.width = np.zeros(shape, dtype=np.int64)
+        self.height = np.zeros(shape, dtype=np.int64)
+
+    def ticks(self, seconds):
+        """Whole ticks until seconds have passed (like Simulation.ticks, also for arrays)"""
+        return np.maximum(1, np.ceil(np.asarray(seconds) * self.tick_rate - 1e-9).astype(np.int64))
+
+    @staticmethod
+    def seed_streams(seed: Optional[int]) -> Dict[str, "np.random.Generator"]:
+        """One generator per subsystem, all derived from a single seed (like rng_streams)"""
+        sequences = np.random.SeedSequence(seed).spawn(len(RNG_STREAMS))
+        return {name: np.random.default_rng(sequence) for name, sequence in zip(RNG_STREAMS, sequences)}
+
+    def random(self, stream: str, games: "np.ndarray") -> "np.ndarray":
+        """One uniform draw in [0, 1) for each of games from the named stream"""
+        return self.rngs[stream].random(len(games))
+
+    def reset(self, seed: Optional[int] = None) -> "np.ndarray":
+        """Start every game afresh and return the observations"""
+        if seed is not None:
+            self.rngs = self.seed_streams(seed)
+        self.reset_games(np.arange(self.num_envs))
+        return self.observation()
+
+    def reset_games(self, games: "np.ndarray"):
+        """Start the given games afresh"""
+        self.frames[games] = 0
+        self.score[games] = 0
+        self.lives[games] = MAX_LIVES
+        self.y[games] = PLAYER_Y
+        self.previous_y[games] = PLAYER_Y
+        self.jump_timer[games] = 0
+        self.jumping[games] = False
+        self.sitting[games] = False
+        self.pose[games] = 0
+        self.x[games] = SCREEN_WIDTH
+        self.previous_x[games] = SCREEN_WIDTH
+        self.active[games] = False
+        self.width[games] = self.base_width
+        self.height[games] = self.base_height
+        self.rock_step[games] = 0
+        self.scale_rocks(games, self.rock_step[games])  # Rocks start at 50% size
+        self.heart_due[games] = self.heart_ticks(games)
+
+    def heart_ticks(self, games: "np.ndarray") -> "np.ndarray":
+        """Random 20-30 seconds (by default) until the next heart of each game"""
+        low, high = self.difficulty["heart_interval_min"], self.difficulty["heart_interval_max"]
+        return self.ticks(low + (high - low) * self.random("hearts", games))
+
+    def scale_rocks(self, games: "np.ndarray", steps: "np.ndarray", columns: Optional["np.ndarray"] = None):
+        """Resize rocks of games to quantized steps (every rock column unless given one per game)"""
+        scale = step_scale(steps)
+        if columns is None:
+            rocks = self.columns["rock"]
+            self.width[np.ix_(games, rocks)] = (self.base_width[rocks] * scale[:, None]).astype(np.int64)
+            self.height[np.ix_(games, rocks)] = (self.base_height[rocks] * scale[:, None]).astype(np.int64)
+        else:
+            self.width[games, columns] = (self.base_width[columns] * scale).astype(np.int64)
+            self.height[games, columns] = (self.base_height[columns] * scale).astype(np.int64)
+
+    def step(self, actions) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray", dict]:
+        """Apply one action per game and run one tick of every game
+
+        Returns (observations, rewards, terminated, truncated, info). Games
+        that ended are already reset; info["score"] and info["frames"] hold
+        their final score and length (and the running values of the others).
+        """
+        actions = np.asarray(actions)
+        score = self.score.copy()
+        lives = self.lives.copy()
+
+        self.apply_actions(actions)
+        self.frames += 1
+        self.update_players()
+        self.spawn()
+
+        # Move everything; free slots move too, which is cheaper than masking them and harmless,
+        # since a slot is put back at the right edge when it is taken
+        speed = self.object_speed * (1.0 + (self.frames // self.speed_ticks) * 0.5)
+        np.copyto(self.previous_x, self.x)
+        self.x -= speed[:, None]
+
+        self.check_collisions()
+
+        rewards = (self.score - score) + (self.lives - lives) * self.life_value
+        terminated = self.lives <= 0
+        truncated = ~terminated & (self.frames >= self.max_frames if self.max_frames is not None else False)
+        info = {"score": self.score.copy(), "frames": self.frames.copy()}
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            self.reset_games(done)
+        return self.observation(), rewards, terminated, truncated, info
+
+    def apply_actions(self, actions: "np.ndarray"):
+        """Jump, sit or stand up where allowed, like PlayerBody"""
+        idle = ~self.jumping & ~self.sitting
+        jump = (actions == JUMP) & idle
+        self.jumping |= jump
+        self.jump_timer[jump] = 0
+        self.sitting |= (actions == SIT) & idle
+        self.sitting &= actions != STAND
+
+    def update_players(self):
+        """Advance the jumps and apply the poses, like PlayerBody.update"""
+        np.copyto(self.previous_y, self.y)
+        jumping = self.jumping
+        self.jump_timer[jumping] += self.tick
+        progress = self.jump_timer / JUMP_DURATION
+        in_air = jumping & (progress < 1.0)
+        self.y = np.where(in_air, PLAYER_Y + 4 * JUMP_HEIGHT * progress * (1 - progress), PLAYER_Y)
+        landed = jumping & ~in_air
+        self.jumping = in_air
+        self.jump_timer[landed] = 0
+        self.pose = np.where(self.jumping, 1, np.where(self.sitting, 2, 0))
+
+    def spawn(self):
+        """Run the spawners and the rock growth that are due this tick"""
+        frames = self.frames
+        growing = np.flatnonzero(frames * self.tick < self.rock_growth_time)
+        if len(growing):
+            progress = np.minimum(frames[growing] * self.tick / self.rock_growth_time, 1.0)
+            steps = progress_step(progress)
+            # Sizes are quantized, so only games whose rocks reached the next step change
+            changed = steps != self.rock_step[growing]
+            if changed.any():
+                growing = growing[changed]
+                self.rock_step[growing] = steps[changed]
+                self.scale_rocks(growing, self.rock_step[growing])
+
+        games = np.flatnonzero(frames % self.obstacle_ticks == 0)
+        if len(games):
+            kinds = np.searchsorted(self.obstacle_weights, self.random("obstacles", games) * self.obstacle_weights[-1],
+                                    side="right")
+            for index, kind in enumerate(OBSTACLE_KINDS):
+                spawned, columns = self.acquire(kind, games[kinds == index])
+                if kind == "rock":
+                    # After 1 minute, assign random size to rocks for variety
+                    late = frames[spawned] * self.tick >= self.rock_growth_time
+                    if late.any():
+                        spawned, columns = spawned[late], columns[late]
+                        self.scale_rocks(spawned, progress_step(self.random("rocks", spawned)), columns)
+
+        games = np.flatnonzero(frames % self.item_ticks == 0)
+        if len(games):
+            kinds = np.searchsorted(self.item_weights, self.random("items", games) * self.item_weights[-1],
+                                    side="right")
+            for index, kind in enumerate(ITEM_KINDS):
+                self.acquire(kind, games[kinds == index])
+
+        games = np.flatnonzero(frames == self.heart_due)
+        if len(games):
+            self.acquire("heart", games)
+            self.heart_due[games] += self.heart_ticks(games)
+
+    def acquire(self, kind: str, games: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """Spawn one entity of kind at the right edge in each of games that has a free slot
+
+        Returns the games that got one and the column it went into.
+        """
+        columns = self.columns[kind]
+        if not len(games) or not len(columns):
+            return games[:0], games[:0]
+        free = ~self.active[np.ix_(games, columns)]
+        has_free = free.any(axis=1)
+        games = games[has_free]
+        columns = columns[free[has_free].argmax(axis=1)]
+        self.active[games, columns] = True
+        self.x[games, columns] = SCREEN_WIDTH
+        self.previous_x[games, columns] = SCREEN_WIDTH
+        return games, columns
+
+    def check_collisions(self):
+        """Apply every swept collision of the last tick and recycle what left the screen"""
+        pose = self.poses[self.pose]
+        bottom = np.trunc(SCREEN_HEIGHT - self.y).astype(np.int64)
+        hitbox_left = int(PLAYER_X) + HITBOX_MARGIN_X
+        hitbox_top = bottom - pose[:, 1]
+        hitbox_width = pose[:, 0] - 2 * HITBOX_MARGIN_X
+        moved_y = bottom - np.trunc(SCREEN_HEIGHT - self.previous_y).astype(np.int64)
+
+        # Everything that can hit the player or be recycled is left of the hitbox's right
+        # edge; comparing the float x is the same as comparing int(x) with that integer
+        games, columns = np.nonzero(self.active & (self.x < (hitbox_left + hitbox_width)[:, None]))
+        if not len(games):
+            return
+        x = self.x[games, columns]
+        previous_x = self.previous_x[games, columns]
+        width = self.width[games, columns]
+        # despawn_x is never positive, so int(x) <= despawn_x is the same as x <= despawn_x
+        recycled = x <= self.despawn_x[columns]
+
+        # Only entities whose x-range over the tick reached into the hitbox can have hit it
+        near = np.flatnonzero(previous_x + width > hitbox_left - 1)
+        hit = np.zeros(len(games), dtype=bool)
+        if len(near):
+            hit_games = games[near]
+            left = np.trunc(x[near]).astype(np.int64)
+            move = left - np.trunc(previous_x[near]).astype(np.int64)
+            width = width[near]
+            height = self.height[hit_games, columns[near]]
+            top = SCREEN_HEIGHT - self.lane_y[columns[near]] - height
+            enter = np.zeros(len(near))
+            leave = np.ones(len(near))
+            for position, size, move, a_position, a_size in (
+                    (left, width, move, hitbox_left, hitbox_width[hit_games]),
+                    (top, height, -moved_y[hit_games], hitbox_top[hit_games], pose[hit_games, 1])):
+                start_position = position - move
+                low = a_position - size
+                high = a_position + a_size
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    t1 = (low - start_position) / move
+                    t2 = (high - start_position) / move
+                still = move == 0
+                static_overlap = (low < start_position) & (start_position < high)
+                enter = np.maximum(enter, np.where(still, np.where(static_overlap, 0.0, 1.0), np.minimum(t1, t2)))
+                leave = np.minimum(leave, np.where(still, np.where(static_overlap, 1.0, 0.0), np.maximum(t1, t2)))
+            hit[near] = ((width > 0) & (height > 0) & (hitbox_width[hit_games] > 0) & (pose[hit_games, 1] > 0)
+                         & (enter < leave))
+
+        if hit.any():
+            # Obstacles first, then items, then the heart, as Simulation applies them
+            hit_games = games[hit]
+            hit_columns = columns[hit]
+            count = self.num_envs
+            self.lives -= np.bincount(hit_games, self.is_obstacle[hit_columns], count).astype(np.int64)
+            self.score += np.bincount(hit_games, self.points[hit_columns], count).astype(np.int64)
+            health = np.bincount(hit_games, self.health[hit_columns], count).astype(np.int64)
+            healed = health > 0
+            self.lives[healed] = np.minimum(self.lives[healed] + health[healed], MAX_LIVES)
+
+        released = hit | recycled
+        games = games[released]
+        columns = columns[released]
+        self.active[games, columns] = False
+        self.x[games, columns] = SCREEN_WIDTH
+        self.previous_x[games, columns] = SCREEN_WIDTH
+
+    def observation(self) -> "np.ndarray":
+        """Observations of every game, one row each, laid out as in env.SkaterEnv"""
+        observations = np.empty((self.num_envs, self.observation_size), dtype=np.float32)
+        observations[:, 0] = (self.y - PLAYER_Y) / JUMP_HEIGHT
+        observations[:, 1] = self.jumping
+        observations[:, 2] = self.sitting
+        observations[:, 3] = self.jump_timer / JUMP_DURATION
+
+        left = PLAYER_X + HITBOX_MARGIN_X
+        multiplier = 1.0 + (self.frames // self.speed_ticks) * 0.5
+        rows = np.arange(self.num_envs)
+        # Entities ahead of the player by x, the rest at infinity
+        ahead = np.where(self.active & (self.x + self.width > left), self.x, np.inf)
+        position = PLAYER_FEATURES
+        for columns in self.lane_columns:
+            # Nearest first: take the smallest x of the lane, per_lane times
+            x = ahead[:, columns]
+            kind_code = self.kind_code[columns]
+            for slot in range(self.per_lane):
+                start = position + slot * ENTITY_FEATURES
+                if slot >= x.shape[1]:
+                    observations[:, start:start + ENTITY_FEATURES] = (1.0, 0.0, 0.0)  # Empty slot
+                    continue
+                nearest = x.argmin(axis=1)
+                nearest_x = x[rows, nearest]
+                found = nearest_x < np.inf
+                observations[:, start] = np.where(found, (nearest_x - left) / SCREEN_WIDTH, 1.0)
+                observations[:, start + 1] = np.where(found, kind_code[nearest], 0.0)
+                observations[:, start + 2] = np.where(found, multiplier, 0.0)
+                x[rows, nearest] = np.inf
+            position += self.per_lane * ENTITY_FEATURES
+        return observations